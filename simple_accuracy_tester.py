@@ -15,6 +15,7 @@ import argparse
 import base64
 import json
 import logging
+import os
 import time
 from datetime import datetime
 from pathlib import Path
@@ -25,18 +26,38 @@ import aiohttp
 logging.basicConfig(level=logging.WARNING)  # Only show warnings and errors
 logger = logging.getLogger(__name__)
 
+IMAGE_EXTENSIONS = frozenset({".jpg", ".jpeg", ".png", ".heic"})
+
+def find_image_files(images_dir: Path) -> List[Path]:
+    """List image files in a directory, matching extensions case-insensitively, in a single scan."""
+    with os.scandir(images_dir) as entries:
+        # Filter on the raw entry name; Path objects are only built for the files kept
+        image_paths = [
+            entry.path for entry in entries
+            if os.path.splitext(entry.name)[1].lower() in IMAGE_EXTENSIONS and entry.is_file()
+        ]
+    return [Path(path) for path in sorted(image_paths)]
+
 def load_image_as_base64(image_path: Path) -> str:
     """Load an image file and convert to base64."""
     with open(image_path, "rb") as f:
         image_data = f.read()
     return base64.b64encode(image_data).decode('utf-8')
 
-async def scan_image(session: aiohttp.ClientSession, image_path: Path, api_url: str) -> Dict[str, Any]:
-    """Scan a single image using the API."""
+def failed_scan_result(image_path: Path, error: str) -> Dict[str, Any]:
+    """Build the result for an image that never got a response from the API."""
+    return {
+        "filename": image_path.name,
+        "success": False,
+        "status_code": 0,
+        "processing_time_ms": 0,
+        "response": None,
+        "error": error
+    }
+
+async def scan_image(session: aiohttp.ClientSession, image_path: Path, image_base64: str, api_url: str) -> Dict[str, Any]:
+    """Scan a single already-encoded image using the API."""
     try:
-        # Load and encode image
-        image_base64 = load_image_as_base64(image_path)
-        
         # Prepare request
         request_data = {
             "image": image_base64,
@@ -65,14 +86,51 @@ async def scan_image(session: aiohttp.ClientSession, image_path: Path, api_url:
             }
             
     except Exception as e:
-        return {
-            "filename": image_path.name,
-            "success": False,
-            "status_code": 0,
-            "processing_time_ms": 0,
-            "response": None,
-            "error": str(e)
-        }
+        return failed_scan_result(image_path, str(e))
+
+async def scan_images(session: aiohttp.ClientSession, image_files: List[Path], api_url: str,
+                      concurrency: int) -> List[Dict[str, Any]]:
+    """Scan all images with up to `concurrency` requests in flight, returning results in input order."""
+    concurrency = max(1, concurrency)
+    # Encoded images wait here for a free scanner; the bound caps how many sit in memory
+    queue: asyncio.Queue = asyncio.Queue(maxsize=concurrency * 2)
+    results: List[Dict[str, Any]] = [None] * len(image_files)
+    completed = 0
+    
+    async def encode_images():
+        # Encoding runs ahead of the scanners so a free scanner never waits on disk or base64
+        for index, image_path in enumerate(image_files):
+            try:
+                encoded = await asyncio.to_thread(load_image_as_base64, image_path)
+            except Exception as e:
+                encoded = e
+            await queue.put((index, image_path, encoded))
+        for _ in range(concurrency):
+            await queue.put(None)
+    
+    async def scan_worker():
+        nonlocal completed
+        while (item := await queue.get()) is not None:
+            index, image_path, encoded = item
+            if isinstance(encoded, Exception):
+                result = failed_scan_result(image_path, str(encoded))
+            else:
+                result = await scan_image(session, image_path, encoded, api_url)
+            result["card_info"] = extract_card_info(result)
+            results[index] = result
+            completed += 1
+            
+            prefix = f"[{completed:3d}/{len(image_files)}] {result['filename']}:"
+            category = result['card_info']['category']
+            if category == "success":
+                print(f"{prefix} ✅ {result['card_info']['card_name']} ({result['processing_time_ms']:.0f}ms)")
+            elif category == "expected_non_identification":
+                print(f"{prefix} ⚠️ {result['card_info']['error_message']}")
+            else:  # failed
+                print(f"{prefix} ❌ {result['card_info']['error_message']}")
+    
+    await asyncio.gather(encode_images(), *(scan_worker() for _ in range(concurrency)))
+    return results
 
 def categorize_result(result: Dict[str, Any]) -> str:
     """Categorize the result into success, expected_non_identification, or failed."""
@@ -704,6 +762,8 @@ async def main():
                        help="Output HTML report file")
     parser.add_argument("--api-url", type=str, default="http://localhost:8000",
                        help="API base URL")
+    parser.add_argument("--concurrency", type=int, default=4,
+                       help="Maximum number of scans in flight at once")
     
     args = parser.parse_args()
     
@@ -713,9 +773,7 @@ async def main():
         print(f"❌ Images directory not found: {images_dir}")
         return
     
-    image_files = []
-    for ext in ['*.jpg', '*.jpeg', '*.png', '*.heic', '*.HEIC']:
-        image_files.extend(images_dir.glob(ext))
+    image_files = find_image_files(images_dir)
     
     if not image_files:
         print(f"❌ No image files found in {images_dir}")
@@ -723,39 +781,27 @@ async def main():
     
     print(f"🔍 Found {len(image_files)} images to test")
     print(f"📊 API URL: {args.api_url}")
+    print(f"⚡ Concurrency: {args.concurrency}")
     print(f"📄 Report will be saved to: {args.output}")
     print()
     
-    # Test API health
-    try:
-        async with aiohttp.ClientSession() as session:
+    # One session for the health check and every scan. The pool matches the scan
+    # concurrency so each in-flight scan reuses its own keep-alive connection.
+    connector = aiohttp.TCPConnector(limit=max(1, args.concurrency), keepalive_timeout=60)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        # Test API health
+        try:
             async with session.get(f"{args.api_url}/api/v1/health", timeout=5) as response:
                 if response.status != 200:
                     print(f"❌ API health check failed: {response.status}")
                     return
                 print("✅ API is healthy")
-    except Exception as e:
-        print(f"❌ Cannot connect to API: {e}")
-        return
-    
-    # Process images
-    results = []
-    
-    async with aiohttp.ClientSession() as session:
-        for i, image_path in enumerate(image_files, 1):
-            print(f"[{i:3d}/{len(image_files)}] Processing {image_path.name}...", end=" ")
-            
-            result = await scan_image(session, image_path, args.api_url)
-            result["card_info"] = extract_card_info(result)
-            results.append(result)
-            
-            category = result['card_info']['category']
-            if category == "success":
-                print(f"✅ {result['card_info']['card_name']} ({result['processing_time_ms']:.0f}ms)")
-            elif category == "expected_non_identification":
-                print(f"⚠️ {result['card_info']['error_message']}")
-            else:  # failed
-                print(f"❌ {result['card_info']['error_message']}")
+        except Exception as e:
+            print(f"❌ Cannot connect to API: {e}")
+            return
+        
+        # Process images
+        results = await scan_images(session, image_files, args.api_url, args.concurrency)
     
     # Generate report
     print(f"\n📊 Generating report: {args.output}")
@@ -42,6 +42,13 @@ class Config:
         self.rate_limit_burst = 20
         self.rate_limit_enabled = True
 
+        # Pokemon TCG API request budget shared by all scans in a process; the
+        # default spreads an API key's 20,000 requests/day evenly over the hours
+        self.tcg_rate_limit_per_hour = int(os.getenv("TCG_RATE_LIMIT_PER_HOUR", "833"))
+
+        # Pokemon TCG response cache (persistent tier is disabled when unset)
+        self.tcg_cache_dir = os.getenv("TCG_CACHE_DIR", "")
+
         # Security Configuration
         self.cors_origins = os.getenv("CORS_ORIGINS", "*").split(",")
         self.enable_api_docs = os.getenv("ENABLE_API_DOCS", "true").lower() == "true"
@@ -59,6 +66,8 @@ class Config:
         self.error_webhook_include_traceback = os.getenv("ERROR_WEBHOOK_INCLUDE_TRACEBACK", "true").lower() == "true"
         self.error_webhook_rate_limit = int(os.getenv("ERROR_WEBHOOK_RATE_LIMIT", "5"))
         self.error_webhook_environment_tag = os.getenv("ERROR_WEBHOOK_ENVIRONMENT_TAG", "production")
+        # Up to this many queued notifications are posted together as {"events": [...]}; 1 disables batching
+        self.error_webhook_batch_size = int(os.getenv("ERROR_WEBHOOK_BATCH_SIZE", "1"))
 
 
 
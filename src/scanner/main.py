@@ -13,7 +13,8 @@ from fastapi.responses import JSONResponse
 from .config import get_config
 from .middleware.security import RateLimitMiddleware, SecurityHeadersMiddleware
 from .routes import health, metrics, scan
-from .services.webhook_service import send_error_webhook
+from .services.tcg_client import close_tcg_clients
+from .services.webhook_service import close_webhook_service, get_webhook_service, send_error_webhook
 
 load_dotenv()
 config = get_config()
@@ -37,6 +38,10 @@ async def lifespan(app: FastAPI):
     yield
     
     logger.info("👋 Shutting down Pokemon Card Scanner API...")
+    
+    # Deliver queued error notifications before the event loop goes away
+    await close_webhook_service()
+    await close_tcg_clients()
 
 
 app = FastAPI(
@@ -71,10 +76,15 @@ async def global_exception_handler(request: Request, exc: Exception):
     import traceback
     
     error_message = f"Unhandled exception: {str(exc)}"
-    error_traceback = traceback.format_exc()
+    
+    # Only format the traceback when something will actually use it
+    error_traceback = None
+    if get_webhook_service().will_notify("CRITICAL", with_traceback=True) or logger.isEnabledFor(logging.DEBUG):
+        error_traceback = traceback.format_exc()
     
     logger.error(f"❌ {error_message}")
-    logger.debug(error_traceback)
+    if error_traceback:
+        logger.debug(error_traceback)
     
     # Send webhook notification
     await send_error_webhook(
@@ -1,7 +1,7 @@
 """Security middleware for rate limiting and security headers."""
 
 import time
-from collections import defaultdict
+from collections import defaultdict, deque
 from typing import Callable
 
 from fastapi import Request, HTTPException
@@ -15,33 +15,43 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
     
     def __init__(self, app):
         super().__init__(app)
-        self.requests = defaultdict(list)  # IP -> list of request timestamps
+        self.requests = defaultdict(deque)  # IP -> request timestamps, oldest on the left
         self.window = 60  # 1 minute window
+        self._last_sweep = time.time()
+        
+        # get_config() is cached for the life of the process, so read the limits once
+        config = get_config()
+        self.enabled = config.rate_limit_enabled
+        self.limit = config.rate_limit_per_minute
+        self.burst = config.rate_limit_burst
     
     async def dispatch(self, request: Request, call_next: Callable):
-        config = get_config()
-        if not config.rate_limit_enabled:
+        if not self.enabled:
             return await call_next(request)
         
         client_ip = self._get_client_ip(request)
         current_time = time.time()
         
-        # Clean old requests outside the window
-        self.requests[client_ip] = [
-            req_time for req_time in self.requests[client_ip]
-            if current_time - req_time < self.window
-        ]
+        # Drop clients that have gone quiet so the table doesn't grow with every IP ever seen
+        if current_time - self._last_sweep >= self.window:
+            self._sweep(current_time)
+        
+        # Clean old requests outside the window; timestamps are in arrival order,
+        # so only expired entries at the left end are touched
+        client_requests = self.requests[client_ip]
+        while client_requests and current_time - client_requests[0] >= self.window:
+            client_requests.popleft()
         
         # Check if client exceeds rate limit
-        if len(self.requests[client_ip]) >= config.rate_limit_per_minute:
+        if len(client_requests) >= self.limit:
             # Allow burst for established clients
-            if len(self.requests[client_ip]) < config.rate_limit_per_minute + config.rate_limit_burst:
+            if len(client_requests) < self.limit + self.burst:
                 # Add to requests but continue
-                self.requests[client_ip].append(current_time)
+                client_requests.append(current_time)
             else:
                 from ..services.error_handler import create_rate_limit_error
                 error_details = create_rate_limit_error(
-                    limit=config.rate_limit_per_minute,
+                    limit=self.limit,
                     window="minute",
                     retry_after=60
                 )
@@ -52,26 +62,34 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
                     detail=error_details.to_dict(),
                     headers={
                         "Retry-After": "60",
-                        "X-RateLimit-Limit": str(config.rate_limit_per_minute),
+                        "X-RateLimit-Limit": str(self.limit),
                         "X-RateLimit-Remaining": "0",
                         "X-RateLimit-Reset": str(int(current_time + self.window)),
                     }
                 )
         
         # Add current request
-        self.requests[client_ip].append(current_time)
+        client_requests.append(current_time)
         
         # Process request
         response = await call_next(request)
         
         # Add rate limit headers to response
-        remaining = max(0, config.rate_limit_per_minute - len(self.requests[client_ip]))
-        response.headers["X-RateLimit-Limit"] = str(config.rate_limit_per_minute)
+        remaining = max(0, self.limit - len(client_requests))
+        response.headers["X-RateLimit-Limit"] = str(self.limit)
         response.headers["X-RateLimit-Remaining"] = str(remaining)
         response.headers["X-RateLimit-Reset"] = str(int(current_time + self.window))
         
         return response
     
+    def _sweep(self, current_time: float) -> None:
+        """Forget clients with no requests inside the window."""
+        cutoff = current_time - self.window
+        stale = [ip for ip, timestamps in self.requests.items() if not timestamps or timestamps[-1] <= cutoff]
+        for ip in stale:
+            del self.requests[ip]
+        self._last_sweep = current_time
+    
     def _get_client_ip(self, request: Request) -> str:
         """Extract client IP from request."""
         # Check for forwarded headers (for reverse proxies)
@@ -88,55 +106,61 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
         return request.client.host if request.client else "unknown"
 
 
+# Security headers sent on every response
+_SECURITY_HEADERS = {
+    "X-Content-Type-Options": "nosniff",
+    "X-Frame-Options": "DENY",
+    "X-XSS-Protection": "1; mode=block",
+    "Referrer-Policy": "strict-origin-when-cross-origin",
+    "Permissions-Policy": "camera=(), microphone=(), geolocation=()",
+}
+
+# Strict CSP for production
+_PRODUCTION_CSP = (
+    "default-src 'self'; "
+    "script-src 'self' 'unsafe-inline'; "
+    "style-src 'self' 'unsafe-inline'; "
+    "img-src 'self' data: blob:; "
+    "connect-src 'self'; "
+    "font-src 'self'; "
+    "object-src 'none'; "
+    "media-src 'self'; "
+    "frame-ancestors 'none'; "
+    "base-uri 'self'; "
+    "form-action 'self'"
+)
+
+# More permissive CSP for development
+_DEVELOPMENT_CSP = (
+    "default-src 'self' 'unsafe-inline' 'unsafe-eval'; "
+    "img-src 'self' data: blob: *; "
+    "connect-src 'self' *; "
+    "frame-ancestors 'none'"
+)
+
+_HSTS = "max-age=31536000; includeSubDomains"
+
+
 class SecurityHeadersMiddleware(BaseHTTPMiddleware):
     """Middleware to add security headers to responses."""
     
+    def __init__(self, app):
+        super().__init__(app)
+        # get_config() is cached for the life of the process, so read the environment once
+        self.is_production = get_config().is_production
+        # The header set only depends on the environment, so build it once
+        self._headers = {
+            **_SECURITY_HEADERS,
+            "Content-Security-Policy": _PRODUCTION_CSP if self.is_production else _DEVELOPMENT_CSP,
+        }
+    
     async def dispatch(self, request: Request, call_next: Callable):
-        config = get_config()
         response = await call_next(request)
         
-        # Security headers
-        security_headers = {
-            "X-Content-Type-Options": "nosniff",
-            "X-Frame-Options": "DENY",
-            "X-XSS-Protection": "1; mode=block",
-            "Referrer-Policy": "strict-origin-when-cross-origin",
-            "Permissions-Policy": "camera=(), microphone=(), geolocation=()",
-        }
-        
-        # Add Content Security Policy
-        if config.is_production:
-            # Strict CSP for production
-            csp = (
-                "default-src 'self'; "
-                "script-src 'self' 'unsafe-inline'; "
-                "style-src 'self' 'unsafe-inline'; "
-                "img-src 'self' data: blob:; "
-                "connect-src 'self'; "
-                "font-src 'self'; "
-                "object-src 'none'; "
-                "media-src 'self'; "
-                "frame-ancestors 'none'; "
-                "base-uri 'self'; "
-                "form-action 'self'"
-            )
-        else:
-            # More permissive CSP for development
-            csp = (
-                "default-src 'self' 'unsafe-inline' 'unsafe-eval'; "
-                "img-src 'self' data: blob: *; "
-                "connect-src 'self' *; "
-                "frame-ancestors 'none'"
-            )
-        
-        security_headers["Content-Security-Policy"] = csp
+        response.headers.update(self._headers)
         
         # Add HSTS header for HTTPS in production
-        if config.is_production and request.url.scheme == "https":
-            security_headers["Strict-Transport-Security"] = "max-age=31536000; includeSubDomains"
+        if self.is_production and request.url.scheme == "https":
+            response.headers["Strict-Transport-Security"] = _HSTS
         
-        # Add headers to response
-        for header, value in security_headers.items():
-            response.headers[header] = value
-        
-        return response
\ No newline at end of file
+        return response
@@ -38,7 +38,10 @@ async def health_check():
     
     # Check TCG client
     try:
-        tcg_client = PokemonTcgClient(api_key=config.pokemon_tcg_api_key)
+        tcg_client = PokemonTcgClient(
+            api_key=config.pokemon_tcg_api_key,
+            rate_limit=config.tcg_rate_limit_per_hour,
+        )
         stats = tcg_client.get_rate_limit_stats()
         tcg_available = stats["remaining_requests"] > 0
         services_status["tcg_api"] = tcg_available
@@ -112,7 +115,8 @@ async def test_webhook():
     )
     
     return {
-        "webhook_test": "sent" if success else "failed",
+        # Delivery happens in the background; see the logs for the POST result
+        "webhook_test": "queued" if success else "failed",
         "webhook_enabled": config.error_webhook_enabled,
         "webhook_url_configured": bool(config.error_webhook_url),
     }
\ No newline at end of file
@@ -230,7 +230,11 @@ async def scan_pokemon_card(request: ScanRequest) -> ScanResponse:
         tcg_start = time.time()
 
         # Use API key for production capacity (20,000 requests/day vs 1,000)
-        tcg_client = PokemonTcgClient(api_key=config.pokemon_tcg_api_key)
+        tcg_client = PokemonTcgClient(
+            api_key=config.pokemon_tcg_api_key,
+            rate_limit=config.tcg_rate_limit_per_hour,
+            cache_dir=config.tcg_cache_dir or None,
+        )
         
         tcg_search_service = TCGSearchService()
         tcg_search_start = time.time()
@@ -358,7 +362,7 @@ async def scan_pokemon_card(request: ScanRequest) -> ScanResponse:
                         best_match_card = card
                         break
 
-            if request.options.include_cost_tracking and config.enable_cost_tracking:
+            if cost_tracker:
                 cost_tracker.track_tcg_usage("search")
         else:
             logger.info("⚠️ TCG search skipped - no Pokemon name identified")
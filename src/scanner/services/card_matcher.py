@@ -6,6 +6,135 @@ from typing import Any, Dict, List, Optional
 
 logger = logging.getLogger(__name__)
 
+# Comprehensive set family mapping, keyed by lowercase set name
+_SET_FAMILIES = {
+    "base": ["Base Set", "Base", "Base Set 2"],
+    "base set": ["Base Set", "Base", "Base Set 2"],
+    "gym": ["Gym Heroes", "Gym Challenge"],
+    "neo": ["Neo Genesis", "Neo Discovery", "Neo Destiny", "Neo Revelation"],
+    "legendary": ["Legendary Collection"],
+    "expedition": ["Expedition", "Expedition Base Set"],
+    "aquapolis": ["Aquapolis"],
+    "skyridge": ["Skyridge"],
+    "ruby": ["Ruby & Sapphire"],
+    "sapphire": ["Ruby & Sapphire"],
+    "ruby & sapphire": ["Ruby & Sapphire"],
+    "sandstorm": ["Sandstorm"],
+    "dragon": ["Dragon"],
+    "team magma": ["Team Magma vs Team Aqua"],
+    "team aqua": ["Team Magma vs Team Aqua"],
+    "hidden legends": ["Hidden Legends"],
+    "firered": ["FireRed & LeafGreen"],
+    "leafgreen": ["FireRed & LeafGreen"],
+    "firered & leafgreen": ["FireRed & LeafGreen"],
+    "team rocket": ["Team Rocket Returns"],
+    "deoxys": ["Deoxys"],
+    "emerald": ["Emerald"],
+    "unseen forces": ["Unseen Forces"],
+    "delta species": ["Delta Species"],
+    "legend maker": ["Legend Maker"],
+    "holon phantoms": ["Holon Phantoms"],
+    "crystal guardians": ["Crystal Guardians"],
+    "dragon frontiers": ["Dragon Frontiers"],
+    "power keepers": ["Power Keepers"],
+    "diamond": ["Diamond & Pearl"],
+    "pearl": ["Diamond & Pearl"],
+    "diamond & pearl": ["Diamond & Pearl"],
+    "mysterious treasures": ["Mysterious Treasures"],
+    "secret wonders": ["Secret Wonders"],
+    "great encounters": ["Great Encounters"],
+    "majestic dawn": ["Majestic Dawn"],
+    "legends awakened": ["Legends Awakened"],
+    "stormfront": ["Stormfront"],
+    "platinum": ["Platinum"],
+    "rising rivals": ["Rising Rivals"],
+    "supreme victors": ["Supreme Victors"],
+    "arceus": ["Arceus"],
+    "heartgold": ["HeartGold & SoulSilver"],
+    "soulsilver": ["HeartGold & SoulSilver"],
+    "heartgold & soulsilver": ["HeartGold & SoulSilver"],
+    "unleashed": ["Unleashed"],
+    "undaunted": ["Undaunted"],
+    "triumphant": ["Triumphant"],
+    "call of legends": ["Call of Legends"],
+    "black": ["Black & White"],
+    "white": ["Black & White"],
+    "black & white": ["Black & White"],
+    "emerging powers": ["Emerging Powers"],
+    "noble victories": ["Noble Victories"],
+    "next destinies": ["Next Destinies"],
+    "dark explorers": ["Dark Explorers"],
+    "dragons exalted": ["Dragons Exalted"],
+    "boundaries crossed": ["Boundaries Crossed"],
+    "plasma storm": ["Plasma Storm"],
+    "plasma freeze": ["Plasma Freeze"],
+    "plasma blast": ["Plasma Blast"],
+    "legendary treasures": ["Legendary Treasures"],
+    "xy": ["XY"],
+    "flashfire": ["Flashfire"],
+    "furious fists": ["Furious Fists"],
+    "phantom forces": ["Phantom Forces"],
+    "primal clash": ["Primal Clash"],
+    "roaring skies": ["Roaring Skies"],
+    "ancient origins": ["Ancient Origins"],
+    "breakthrough": ["BREAKthrough"],
+    "breakpoint": ["BREAKpoint"],
+    "generations": ["Generations"],
+    "fates collide": ["Fates Collide"],
+    "steam siege": ["Steam Siege"],
+    "evolutions": ["Evolutions"],
+    "sun": ["Sun & Moon"],
+    "moon": ["Sun & Moon"],
+    "sun & moon": ["Sun & Moon"],
+    "guardians rising": ["Guardians Rising"],
+    "burning shadows": ["Burning Shadows"],
+    "shining legends": ["Shining Legends"],
+    "crimson invasion": ["Crimson Invasion"],
+    "ultra prism": ["Ultra Prism"],
+    "forbidden light": ["Forbidden Light"],
+    "celestial storm": ["Celestial Storm"],
+    "dragon majesty": ["Dragon Majesty"],
+    "lost thunder": ["Lost Thunder"],
+    "team up": ["Team Up"],
+    "detective pikachu": ["Detective Pikachu"],
+    "unbroken bonds": ["Unbroken Bonds"],
+    "unified minds": ["Unified Minds"],
+    "hidden fates": ["Hidden Fates"],
+    "cosmic eclipse": ["Cosmic Eclipse"],
+    "sword": ["Sword & Shield"],
+    "shield": ["Sword & Shield"],
+    "sword & shield": ["Sword & Shield"],
+    "rebel clash": ["Rebel Clash"],
+    "darkness ablaze": ["Darkness Ablaze"],
+    "champions path": ["Champion's Path"],
+    "vivid voltage": ["Vivid Voltage"],
+    "shining fates": ["Shining Fates"],
+    "battle styles": ["Battle Styles"],
+    "chilling reign": ["Chilling Reign"],
+    "evolving skies": ["Evolving Skies"],
+    "celebrations": ["Celebrations"],
+    "fusion strike": ["Fusion Strike"],
+    "brilliant stars": ["Brilliant Stars"],
+    "astral radiance": ["Astral Radiance"],
+    "pokemon go": ["Pokémon GO"],
+    "lost origin": ["Lost Origin"],
+    "silver tempest": ["Silver Tempest"],
+    "crown zenith": ["Crown Zenith"],
+    "scarlet": ["Scarlet & Violet"],
+    "violet": ["Scarlet & Violet"],
+    "scarlet & violet": ["Scarlet & Violet"],
+    "paldea evolved": ["Paldea Evolved"],
+    "obsidian flames": ["Obsidian Flames"],
+    "151": ["151"],
+    "paradox rift": ["Paradox Rift"],
+    "paldean fates": ["Paldean Fates"],
+    "temporal forces": ["Temporal Forces"],
+    "twilight masquerade": ["Twilight Masquerade"],
+    "shrouded fable": ["Shrouded Fable"],
+    "stellar crown": ["Stellar Crown"],
+    "surging sparks": ["Surging Sparks"],
+}
+
 
 def get_set_family(set_name: str) -> Optional[List[str]]:
     """
@@ -20,138 +149,9 @@ def get_set_family(set_name: str) -> Optional[List[str]]:
     if not set_name:
         return None
 
-    set_name_lower = set_name.lower()
-
-    # Comprehensive set family mapping
-    set_families = {
-        "base": ["Base Set", "Base", "Base Set 2"],
-        "base set": ["Base Set", "Base", "Base Set 2"],
-        "gym": ["Gym Heroes", "Gym Challenge"],
-        "neo": ["Neo Genesis", "Neo Discovery", "Neo Destiny", "Neo Revelation"],
-        "legendary": ["Legendary Collection"],
-        "expedition": ["Expedition", "Expedition Base Set"],
-        "aquapolis": ["Aquapolis"],
-        "skyridge": ["Skyridge"],
-        "ruby": ["Ruby & Sapphire"],
-        "sapphire": ["Ruby & Sapphire"],
-        "ruby & sapphire": ["Ruby & Sapphire"],
-        "sandstorm": ["Sandstorm"],
-        "dragon": ["Dragon"],
-        "team magma": ["Team Magma vs Team Aqua"],
-        "team aqua": ["Team Magma vs Team Aqua"],
-        "hidden legends": ["Hidden Legends"],
-        "firered": ["FireRed & LeafGreen"],
-        "leafgreen": ["FireRed & LeafGreen"],
-        "firered & leafgreen": ["FireRed & LeafGreen"],
-        "team rocket": ["Team Rocket Returns"],
-        "deoxys": ["Deoxys"],
-        "emerald": ["Emerald"],
-        "unseen forces": ["Unseen Forces"],
-        "delta species": ["Delta Species"],
-        "legend maker": ["Legend Maker"],
-        "holon phantoms": ["Holon Phantoms"],
-        "crystal guardians": ["Crystal Guardians"],
-        "dragon frontiers": ["Dragon Frontiers"],
-        "power keepers": ["Power Keepers"],
-        "diamond": ["Diamond & Pearl"],
-        "pearl": ["Diamond & Pearl"],
-        "diamond & pearl": ["Diamond & Pearl"],
-        "mysterious treasures": ["Mysterious Treasures"],
-        "secret wonders": ["Secret Wonders"],
-        "great encounters": ["Great Encounters"],
-        "majestic dawn": ["Majestic Dawn"],
-        "legends awakened": ["Legends Awakened"],
-        "stormfront": ["Stormfront"],
-        "platinum": ["Platinum"],
-        "rising rivals": ["Rising Rivals"],
-        "supreme victors": ["Supreme Victors"],
-        "arceus": ["Arceus"],
-        "heartgold": ["HeartGold & SoulSilver"],
-        "soulsilver": ["HeartGold & SoulSilver"],
-        "heartgold & soulsilver": ["HeartGold & SoulSilver"],
-        "unleashed": ["Unleashed"],
-        "undaunted": ["Undaunted"],
-        "triumphant": ["Triumphant"],
-        "call of legends": ["Call of Legends"],
-        "black": ["Black & White"],
-        "white": ["Black & White"],
-        "black & white": ["Black & White"],
-        "emerging powers": ["Emerging Powers"],
-        "noble victories": ["Noble Victories"],
-        "next destinies": ["Next Destinies"],
-        "dark explorers": ["Dark Explorers"],
-        "dragons exalted": ["Dragons Exalted"],
-        "boundaries crossed": ["Boundaries Crossed"],
-        "plasma storm": ["Plasma Storm"],
-        "plasma freeze": ["Plasma Freeze"],
-        "plasma blast": ["Plasma Blast"],
-        "legendary treasures": ["Legendary Treasures"],
-        "xy": ["XY"],
-        "flashfire": ["Flashfire"],
-        "furious fists": ["Furious Fists"],
-        "phantom forces": ["Phantom Forces"],
-        "primal clash": ["Primal Clash"],
-        "roaring skies": ["Roaring Skies"],
-        "ancient origins": ["Ancient Origins"],
-        "breakthrough": ["BREAKthrough"],
-        "breakpoint": ["BREAKpoint"],
-        "generations": ["Generations"],
-        "fates collide": ["Fates Collide"],
-        "steam siege": ["Steam Siege"],
-        "evolutions": ["Evolutions"],
-        "sun": ["Sun & Moon"],
-        "moon": ["Sun & Moon"],
-        "sun & moon": ["Sun & Moon"],
-        "guardians rising": ["Guardians Rising"],
-        "burning shadows": ["Burning Shadows"],
-        "shining legends": ["Shining Legends"],
-        "crimson invasion": ["Crimson Invasion"],
-        "ultra prism": ["Ultra Prism"],
-        "forbidden light": ["Forbidden Light"],
-        "celestial storm": ["Celestial Storm"],
-        "dragon majesty": ["Dragon Majesty"],
-        "lost thunder": ["Lost Thunder"],
-        "team up": ["Team Up"],
-        "detective pikachu": ["Detective Pikachu"],
-        "unbroken bonds": ["Unbroken Bonds"],
-        "unified minds": ["Unified Minds"],
-        "hidden fates": ["Hidden Fates"],
-        "cosmic eclipse": ["Cosmic Eclipse"],
-        "sword": ["Sword & Shield"],
-        "shield": ["Sword & Shield"],
-        "sword & shield": ["Sword & Shield"],
-        "rebel clash": ["Rebel Clash"],
-        "darkness ablaze": ["Darkness Ablaze"],
-        "champions path": ["Champion's Path"],
-        "vivid voltage": ["Vivid Voltage"],
-        "shining fates": ["Shining Fates"],
-        "battle styles": ["Battle Styles"],
-        "chilling reign": ["Chilling Reign"],
-        "evolving skies": ["Evolving Skies"],
-        "celebrations": ["Celebrations"],
-        "fusion strike": ["Fusion Strike"],
-        "brilliant stars": ["Brilliant Stars"],
-        "astral radiance": ["Astral Radiance"],
-        "pokemon go": ["Pokémon GO"],
-        "lost origin": ["Lost Origin"],
-        "silver tempest": ["Silver Tempest"],
-        "crown zenith": ["Crown Zenith"],
-        "scarlet": ["Scarlet & Violet"],
-        "violet": ["Scarlet & Violet"],
-        "scarlet & violet": ["Scarlet & Violet"],
-        "paldea evolved": ["Paldea Evolved"],
-        "obsidian flames": ["Obsidian Flames"],
-        "151": ["151"],
-        "paradox rift": ["Paradox Rift"],
-        "paldean fates": ["Paldean Fates"],
-        "temporal forces": ["Temporal Forces"],
-        "twilight masquerade": ["Twilight Masquerade"],
-        "shrouded fable": ["Shrouded Fable"],
-        "stellar crown": ["Stellar Crown"],
-        "surging sparks": ["Surging Sparks"],
-    }
-
-    return set_families.get(set_name_lower)
+    # Copy so callers can't mutate the shared mapping
+    family = _SET_FAMILIES.get(set_name.lower())
+    return list(family) if family else None
 
 
 def is_xy_family_match(gemini_set: str, card_set: str) -> bool:
@@ -4,23 +4,53 @@ Simplified version focusing on card search functionality.
 """
 
 import asyncio
-import hashlib
-import json
 import logging
+import random
 import re
+import sqlite3
+import sys
 import time
-from typing import Any, Dict, List, Optional
+from collections import OrderedDict
+from contextlib import closing
+from functools import lru_cache, partial
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
 
 import httpx
-from tenacity import (
-    retry,
-    retry_if_exception_type,
-    stop_after_attempt,
-    wait_exponential,
-)
+import orjson
 
 logger = logging.getLogger(__name__)
 
+# Try to import the aiohttp-backed transport (better throughput under concurrency)
+try:
+    import aiohttp
+    from httpx_aiohttp import AiohttpTransport
+    AIOHTTP_TRANSPORT_SUPPORTED = True
+except ImportError:
+    AIOHTTP_TRANSPORT_SUPPORTED = False
+
+# Try to import aiodns for non-blocking DNS resolution in the aiohttp transport
+try:
+    import aiodns  # noqa: F401
+    AIODNS_SUPPORTED = True
+except ImportError:
+    AIODNS_SUPPORTED = False
+
+# HTTP/2 needs the optional h2 package (httpx[http2])
+try:
+    import h2  # noqa: F401
+    HTTP2_SUPPORTED = True
+except ImportError:
+    HTTP2_SUPPORTED = False
+
+# Connection pool sizing shared by the httpx and aiohttp transports
+_MAX_CONNECTIONS = 50
+_MAX_KEEPALIVE_CONNECTIONS = 20
+_KEEPALIVE_EXPIRY = 30.0
+
+# Interned so cache-key comparisons on the hot endpoint short-circuit on identity
+_CARDS_ENDPOINT = sys.intern("/cards")
+
 
 class RateLimitError(Exception):
     """Raised when API rate limit is exceeded."""
@@ -32,6 +62,111 @@ class PokemonTcgApiError(Exception):
     pass
 
 
+class _DiskCache:
+    """
+    SQLite-backed response cache that survives process restarts.
+    
+    Reads and writes run in a worker thread; writes are buffered and flushed
+    in one transaction shortly after the first one so the request path never
+    waits on disk. Expiry uses wall-clock time since it must outlive the process.
+    
+    The file may be shared by several workers, so SQLite errors (e.g. "database
+    is locked") are logged and treated as a cache miss or a dropped write.
+    """
+
+    FLUSH_DELAY = 0.5
+
+    # Seconds a connection waits for another worker's lock before failing
+    BUSY_TIMEOUT = 5.0
+
+    def __init__(self, cache_dir: Union[str, Path]):
+        self.path = Path(cache_dir) / "tcg_cache.sqlite3"
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._pending: Dict[str, Tuple[float, bytes]] = {}
+        self._flush_task: Optional[asyncio.Task] = None
+        with closing(self._connect()) as conn, conn:
+            # WAL lets readers in other workers proceed while one of them writes
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache "
+                "(key TEXT PRIMARY KEY, expires REAL, data BLOB)"
+            )
+
+    async def get(self, key: str) -> Optional[Any]:
+        """Return cached data for key, or None if missing or expired."""
+        entry = self._pending.get(key)
+        if entry is None:
+            entry = await asyncio.to_thread(self._read, key)
+        if entry is None or entry[0] <= time.time():
+            return None
+        return orjson.loads(entry[1])
+
+    def set(self, key: str, data: Any, ttl: float) -> None:
+        """Buffer data for key and schedule a flush."""
+        self._pending[key] = (time.time() + ttl, orjson.dumps(data))
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.get_running_loop().create_task(self._flush_later())
+
+    async def flush(self) -> None:
+        """Write all buffered entries and drop expired rows."""
+        if not self._pending:
+            return
+        rows = [(key, expires, data) for key, (expires, data) in self._pending.items()]
+        self._pending.clear()
+        await asyncio.to_thread(self._write, rows)
+
+    async def _flush_later(self) -> None:
+        await asyncio.sleep(self.FLUSH_DELAY)
+        await self.flush()
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=self.BUSY_TIMEOUT)
+
+    def _read(self, key: str) -> Optional[Tuple[float, bytes]]:
+        try:
+            with closing(self._connect()) as conn:
+                return conn.execute(
+                    "SELECT expires, data FROM cache WHERE key = ?", (key,)
+                ).fetchone()
+        except sqlite3.Error as e:
+            logger.warning("⚠️ TCG disk cache read failed, treating as a miss: %s", e)
+            return None
+
+    def _write(self, rows: List[Tuple[str, float, bytes]]) -> None:
+        try:
+            with closing(self._connect()) as conn, conn:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO cache (key, expires, data) VALUES (?, ?, ?)", rows
+                )
+                conn.execute("DELETE FROM cache WHERE expires <= ?", (time.time(),))
+        except sqlite3.Error as e:
+            logger.warning("⚠️ TCG disk cache write failed, dropping %d entries: %s", len(rows), e)
+
+
+class _SharedClientState:
+    """Cache, in-flight, rate-limit and HTTP client state shared by clients for one API account."""
+
+    def __init__(self, rate_limit: int):
+        # LRU-ordered (oldest first) entries of (expires_at, data), with
+        # expires_at on the monotonic clock
+        self.cache: OrderedDict[Tuple, Tuple[float, Any]] = OrderedDict()
+        self.inserts_since_sweep = 0
+        # Requests currently on the wire, keyed like the cache
+        self.inflight: Dict[Tuple, asyncio.Future] = {}
+        # Token bucket: refills rate_limit tokens per hour, one token per request
+        self.tokens = float(rate_limit)
+        self.last_refill = time.monotonic()
+        # Optional persistent tier behind the in-memory cache
+        self.disk: Optional[_DiskCache] = None
+        # HTTP clients (and their connection pools), keyed by whether they use
+        # the aiohttp transport; closed by close_tcg_clients() at shutdown
+        self.http_clients: Dict[bool, httpx.AsyncClient] = {}
+
+
+# Shared state per (base_url, api_key)
+_SHARED_STATES: Dict[Tuple[str, Optional[str]], _SharedClientState] = {}
+
+
 class PokemonTcgClient:
     """
     Client for interacting with the Pokemon TCG API.
@@ -112,12 +247,26 @@ class PokemonTcgClient:
         "Triumphant": "HS—Triumphant",
     }
 
+    # Case-insensitive view of SET_NAME_MAPPINGS: one lookup on the lowered name
+    SET_NAME_MAPPINGS_CI = {
+        gemini_name.lower(): tcg_name for gemini_name, tcg_name in SET_NAME_MAPPINGS.items()
+    }
+
+    # Attempts per request for transport-level failures
+    MAX_RETRIES = 3
+
+    # Cache inserts between sweeps of expired entries
+    CACHE_SWEEP_INTERVAL = 100
+
     def __init__(
         self,
         api_key: Optional[str] = None,
         base_url: str = "https://api.pokemontcg.io/v2",
         rate_limit: int = 100,
         cache_ttl: int = 3600,
+        use_aiohttp_transport: bool = True,
+        max_cache_entries: int = 1000,
+        cache_dir: Optional[Union[str, Path]] = None,
     ):
         """
         Initialize the Pokemon TCG API client.
@@ -127,11 +276,17 @@ class PokemonTcgClient:
             base_url: Base URL for the API
             rate_limit: Maximum requests per hour
             cache_ttl: Cache time-to-live in seconds
+            use_aiohttp_transport: Use the aiohttp transport when httpx-aiohttp
+                is installed (set False to fall back to httpx's default transport)
+            max_cache_entries: Maximum cached responses before LRU eviction
+            cache_dir: Directory for a persistent SQLite cache shared across
+                restarts and processes (disabled when None)
         """
         self.api_key = api_key
         self.base_url = base_url
         self.rate_limit = rate_limit
         self.cache_ttl = cache_ttl
+        self.max_cache_entries = max_cache_entries
         
         # Log API key usage
         if self.api_key:
@@ -139,18 +294,53 @@ class PokemonTcgClient:
         else:
             logger.warning("⚠️ Pokemon TCG API client initialized without API key - limited to 1,000 requests/day")
         
-        self.cache: Dict[str, Dict[str, Any]] = {}
-        self.request_timestamps: List[float] = []
+        # Routes build a client per scan, so cache, rate-limit and HTTP client state
+        # live in a module-level registry shared by every client for the same account
+        state_key = (base_url, api_key)
+        self._state = _SHARED_STATES.get(state_key)
+        if self._state is None:
+            self._state = _SHARED_STATES[state_key] = _SharedClientState(rate_limit)
+        if cache_dir and self._state.disk is None:
+            try:
+                self._state.disk = _DiskCache(cache_dir)
+            except sqlite3.Error as e:
+                # Serve from memory and the API; the next client retries the disk tier
+                logger.warning(f"⚠️ TCG disk cache unavailable: {e}")
+        self.cache = self._state.cache
+        self._inflight = self._state.inflight
+        self._disk = self._state.disk
         
-        # Configure HTTP client
+        # Reuse the account's HTTP client so every scan shares one connection pool
+        use_aiohttp = bool(use_aiohttp_transport and AIOHTTP_TRANSPORT_SUPPORTED)
+        self.client = self._state.http_clients.get(use_aiohttp)
+        if self.client is None or self.client.is_closed:
+            self.client = self._state.http_clients[use_aiohttp] = self._create_http_client(use_aiohttp)
+
+    def _create_http_client(self, use_aiohttp: bool) -> httpx.AsyncClient:
+        """Build the HTTP client shared by all clients for this account."""
         headers = {"Accept": "application/json"}
         if self.api_key:
             headers["X-Api-Key"] = self.api_key
             
-        self.client = httpx.AsyncClient(
+        limits = httpx.Limits(
+            max_keepalive_connections=_MAX_KEEPALIVE_CONNECTIONS,
+            max_connections=_MAX_CONNECTIONS,
+            keepalive_expiry=_KEEPALIVE_EXPIRY,
+        )
+        client_kwargs: Dict[str, Any] = {}
+        if use_aiohttp:
+            client_kwargs["transport"] = AiohttpTransport(
+                limits=limits, client=_create_aiohttp_session
+            )
+
+        # http2/limits configure httpx's own pool; a custom transport manages its own
+        return httpx.AsyncClient(
             base_url=self.base_url,
             headers=headers,
             timeout=httpx.Timeout(30.0),
+            http2=HTTP2_SUPPORTED,
+            limits=limits,
+            **client_kwargs,
         )
 
     async def __aenter__(self):
@@ -158,81 +348,127 @@ class PokemonTcgClient:
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        """Async context manager exit - close HTTP client."""
-        await self.client.aclose()
+        """
+        Async context manager exit - flush the disk cache.
+        
+        The HTTP client is shared with other scans and stays open until
+        close_tcg_clients() runs at shutdown.
+        """
+        if self._disk is not None:
+            await self._disk.flush()
+
+    def _refill_tokens(self) -> float:
+        """Top up the token bucket for the time elapsed since the last refill."""
+        now = time.monotonic()
+        state = self._state
+        state.tokens = min(
+            self.rate_limit,
+            state.tokens + (now - state.last_refill) * self.rate_limit / 3600.0,
+        )
+        state.last_refill = now
+        return state.tokens
 
     def _is_rate_limited(self) -> bool:
         """Check if we've exceeded rate limits."""
-        now = time.time()
-        hour_ago = now - 3600
-        
-        self.request_timestamps = [
-            ts for ts in self.request_timestamps if ts > hour_ago
-        ]
-        
-        return len(self.request_timestamps) >= self.rate_limit
+        return self._refill_tokens() < 1.0
 
-    def _get_cache_key(self, endpoint: str, params: Optional[Dict] = None) -> str:
-        """Generate cache key from endpoint and parameters."""
-        key_parts = {"endpoint": endpoint, "params": params or {}}
-        key_string = json.dumps(key_parts, sort_keys=True)
-        return hashlib.md5(key_string.encode()).hexdigest()
+    @staticmethod
+    def _get_cache_key(
+        endpoint: str, params: Optional[Union[Dict, Sequence[Tuple[str, Any]]]] = None
+    ) -> Tuple:
+        """Generate a hashable cache key from endpoint and parameters."""
+        if not params:
+            return (endpoint, ())
+        items = params.items() if isinstance(params, dict) else params
+        # List values (e.g. types) become tuples so the key stays hashable
+        return (endpoint, tuple(sorted(
+            (key, tuple(value) if isinstance(value, list) else value)
+            for key, value in items
+        )))
 
-    def _get_from_cache(self, cache_key: str) -> Optional[Any]:
+    def _get_from_cache(self, cache_key: Tuple) -> Optional[Any]:
         """Retrieve data from cache if available and not expired."""
-        if cache_key in self.cache:
-            entry = self.cache[cache_key]
-            if entry.get("expires_at", 0) > time.time():
-                return entry.get("data")
-            else:
-                del self.cache[cache_key]
+        entry = self.cache.get(cache_key)
+        if entry is None:
+            return None
+        if entry[0] > time.monotonic():
+            self.cache.move_to_end(cache_key)
+            return entry[1]
+        del self.cache[cache_key]
         return None
 
-    def _add_to_cache(self, cache_key: str, data: Any) -> None:
-        """Add response data to cache with timestamp."""
-        self.cache[cache_key] = {
-            "data": data,
-            "expires_at": time.time() + self.cache_ttl,
-        }
+    def _sweep_expired(self) -> None:
+        """Drop expired entries that would otherwise stay until read or evicted."""
+        cache = self.cache
+        now = time.monotonic()
+        expired = [key for key, (expires_at, _) in cache.items() if expires_at <= now]
+        for key in expired:
+            del cache[key]
+        self._state.inserts_since_sweep = 0
+
+    def _add_to_cache(self, cache_key: Tuple, data: Any) -> None:
+        """Add response data to cache with its expiry time, evicting LRU entries."""
+        self._state.inserts_since_sweep += 1
+        if self._state.inserts_since_sweep >= self.CACHE_SWEEP_INTERVAL:
+            self._sweep_expired()
+
+        self.cache[cache_key] = (time.monotonic() + self.cache_ttl, data)
+        self.cache.move_to_end(cache_key)
+        while len(self.cache) > self.max_cache_entries:
+            self.cache.popitem(last=False)
 
-    @retry(
-        retry=retry_if_exception_type(httpx.HTTPError),
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=2, max=10),
-    )
     async def _make_request(
         self, method: str, endpoint: str, **kwargs
     ) -> Dict[str, Any]:
-        """Make an HTTP request with rate limiting and error handling."""
+        """Make an HTTP request, retrying transport errors with exponential backoff."""
+        for attempt in range(self.MAX_RETRIES):
+            try:
+                return await self._send_request(method, endpoint, **kwargs)
+            except httpx.HTTPError as e:
+                if attempt == self.MAX_RETRIES - 1:
+                    raise
+                # Exponential backoff with jitter so concurrent retries spread out
+                wait = min(10, 2 * 2 ** attempt) + random.uniform(0, 0.3)
+                logger.warning(f"   ↻ Request failed ({e!r}), retrying in {wait:.2f}s")
+                await asyncio.sleep(wait)
+
+    async def _send_request(
+        self, method: str, endpoint: str, **kwargs
+    ) -> Dict[str, Any]:
+        """Make a single HTTP request with rate limiting and error handling."""
         if self._is_rate_limited():
             logger.warning(f"🚫 Rate limit exceeded: {self.rate_limit} requests per hour")
             raise RateLimitError(
                 f"Rate limit exceeded: {self.rate_limit} requests per hour"
             )
         
-        self.request_timestamps.append(time.time())
+        self._state.tokens -= 1
         
-        url = f"{self.base_url}{endpoint}"
-        logger.info(f"🌐 Pokemon TCG API Request: {method} {url}")
-        if kwargs.get("params"):
-            logger.info(f"   Parameters: {kwargs['params']}")
+        # %-style args and the isEnabledFor guard keep formatting off the
+        # hot path when INFO is filtered out (the usual production setting)
+        log_info = logger.isEnabledFor(logging.INFO)
+        if log_info:
+            logger.info("🌐 Pokemon TCG API Request: %s %s%s", method, self.base_url, endpoint)
+            if kwargs.get("params"):
+                logger.info("   Parameters: %s", kwargs["params"])
         
         try:
-            start_time = time.time()
+            start_time = time.monotonic()
             response = await self.client.request(method, endpoint, **kwargs)
             response.raise_for_status()
-            request_time = time.time() - start_time
+            request_time = time.monotonic() - start_time
             
-            logger.info(f"   ✓ Response: {response.status_code} in {request_time:.2f}s")
+            logger.info("   ✓ Response: %s in %.2fs", response.status_code, request_time)
             
-            data = response.json()
+            # orjson parses the (often large) card payloads several times faster
+            data = orjson.loads(response.content)
             
             # Log data summary
-            if isinstance(data, dict) and "data" in data:
+            if log_info and isinstance(data, dict) and "data" in data:
                 if isinstance(data["data"], list):
-                    logger.info(f"   ← Received {len(data['data'])} items")
+                    logger.info("   ← Received %d items", len(data["data"]))
                 else:
-                    logger.info(f"   ← Received single item")
+                    logger.info("   ← Received single item")
             
             return data
             
@@ -244,13 +480,69 @@ class PokemonTcgClient:
                 logger.info("   ← No results found (404)")
                 return {"data": [], "totalCount": 0}
             elif e.response.status_code >= 400:
-                error_data = e.response.json() if e.response.content else {}
-                logger.error(f"   ✗ API error {e.response.status_code}: {error_data}")
+                # The body is only used for diagnostics, so skip JSON parsing
+                error_snippet = e.response.text[:512] if e.response.content else ""
+                logger.error(f"   ✗ API error {e.response.status_code}: {error_snippet}")
                 raise PokemonTcgApiError(
-                    f"API error {e.response.status_code}: {error_data}"
+                    f"API error {e.response.status_code}: {error_snippet}"
                 ) from e
             raise
 
+    async def _fetch_and_cache(
+        self,
+        cache_key: Tuple,
+        method: str,
+        endpoint: str,
+        *,
+        transform: Optional[Callable[[Dict[str, Any]], Dict[str, Any]]] = None,
+        **kwargs,
+    ) -> Dict[str, Any]:
+        """
+        Make a request and cache its response, coalescing identical concurrent calls.
+        
+        Callers that miss the cache while the same request is already in flight
+        await that request instead of issuing (and rate-limiting) another one.
+        If given, transform is applied to the response before it is cached.
+        """
+        task = self._inflight.get(cache_key)
+        if task is None:
+            task = asyncio.get_running_loop().create_task(
+                self._fetch_shared(cache_key, method, endpoint, transform, kwargs)
+            )
+            self._inflight[cache_key] = task
+        else:
+            logger.info("🔗 Joining in-flight request")
+        # The request runs in its own task and every caller, including the one
+        # that started it, is shielded: cancelling one scan's call (e.g. a
+        # superseded prefetch) leaves the request running for the others
+        return await asyncio.shield(task)
+
+    async def _fetch_shared(
+        self,
+        cache_key: Tuple,
+        method: str,
+        endpoint: str,
+        transform: Optional[Callable[[Dict[str, Any]], Dict[str, Any]]],
+        kwargs: Dict[str, Any],
+    ) -> Dict[str, Any]:
+        """Body of the in-flight task started by _fetch_and_cache."""
+        try:
+            data = None
+            if self._disk is not None:
+                disk_key = repr(cache_key)
+                data = await self._disk.get(disk_key)
+            if data is None:
+                data = await self._make_request(method, endpoint, **kwargs)
+                if transform is not None:
+                    data = transform(data)
+                if self._disk is not None:
+                    self._disk.set(disk_key, data, self.cache_ttl)
+        finally:
+            del self._inflight[cache_key]
+        
+        self._add_to_cache(cache_key, data)
+        return data
+
     async def search_cards(
         self,
         name: Optional[str] = None,
@@ -282,10 +574,10 @@ class PokemonTcgClient:
         Returns:
             API response with matching cards
         """
-        params = {
-            "page": page,
-            "pageSize": min(page_size, 250),  # API max is 250
-        }
+        params: List[Tuple[str, Any]] = [
+            ("page", page),
+            ("pageSize", min(page_size, 250)),  # API max is 250
+        ]
         
         query_parts = []
         if name:
@@ -299,7 +591,7 @@ class PokemonTcgClient:
             # Map the set name to handle common discrepancies
             mapped_set_name = self._map_set_name(set_name)
             query_parts.append(f'set.name:"{mapped_set_name}"')
-            logger.info(f"   🗺️ Set name mapping: '{set_name}' → '{mapped_set_name}'")
+            logger.info("   🗺️ Set name mapping: '%s' → '%s'", set_name, mapped_set_name)
         if number:
             # Normalize card number
             normalized_number = self._normalize_card_number(number)
@@ -307,55 +599,173 @@ class PokemonTcgClient:
         if supertype:
             query_parts.append(f'supertype:{supertype}')
         if types:
-            for ptype in types:
-                query_parts.append(f'types:{ptype}')
+            query_parts.append(" ".join(f'types:{ptype}' for ptype in types))
         if hp:
             query_parts.append(f'hp:{hp}')
             
         if query_parts:
-            params["q"] = " ".join(query_parts)
-            logger.info(f"   🔍 TCG API Query: {params['q']}")
+            query = " ".join(query_parts)
+            params.append(("q", query))
+            logger.info("   🔍 TCG API Query: %s", query)
             
         if order_by:
-            params["orderBy"] = order_by
-            
-        cache_key = self._get_cache_key("/cards", params)
+            params.append(("orderBy", order_by))
+        
+        # httpx accepts a sequence of pairs directly, skipping dict handling
+        params_items = tuple(params)
+        cache_key = self._get_cache_key(_CARDS_ENDPOINT, params_items)
         
         cached_data = self._get_from_cache(cache_key)
         if cached_data is not None:
             logger.info("📦 Cache hit for card search")
             return cached_data
             
-        data = await self._make_request("GET", "/cards", params=params)
-        
-        self._add_to_cache(cache_key, data)
-        
-        return data
+        return await self._fetch_and_cache(
+            cache_key, "GET", _CARDS_ENDPOINT, params=params_items
+        )
 
-    async def get_card_by_id(self, card_id: str) -> Dict[str, Any]:
+    async def get_card_by_id(
+        self, card_id: str, fields: Optional[Sequence[str]] = None
+    ) -> Dict[str, Any]:
         """
         Get a specific Pokemon card by ID.
         
         Args:
             card_id: Unique card ID (e.g., "base1-25")
+            fields: Top-level card fields to keep (e.g. ("name", "images")).
+                Only the projection is cached, which keeps entries small
+                when callers need a few fields of the full card JSON.
             
         Returns:
             Card data
         """
-        cache_key = self._get_cache_key(f"/cards/{card_id}")
+        endpoint = sys.intern(f"{_CARDS_ENDPOINT}/{card_id}")
+        fields = tuple(fields) if fields else None
+        cache_key = self._get_cache_key(endpoint, {"fields": fields} if fields else None)
         cached_data = self._get_from_cache(cache_key)
         if cached_data is not None:
-            logger.info(f"📦 Cache hit for card: {card_id}")
+            logger.info("📦 Cache hit for card: %s", card_id)
             return cached_data
             
-        logger.info(f"🔍 Fetching card from API: {card_id}")
-        data = await self._make_request("GET", f"/cards/{card_id}")
-        
-        self._add_to_cache(cache_key, data)
-        logger.info(f"   💾 Cached card: {card_id}")
+        logger.info("🔍 Fetching card from API: %s", card_id)
+        data = await self._fetch_and_cache(
+            cache_key,
+            "GET",
+            endpoint,
+            transform=partial(_project_card, fields=fields) if fields else None,
+        )
+        logger.info("   💾 Cached card: %s", card_id)
         
         return data
 
+    async def get_cards_by_ids(self, card_ids: Sequence[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Get several Pokemon cards, fetching all uncached ones in batched searches.
+        
+        Cards missing from both the memory and disk caches are looked up with
+        one ``id:a OR id:b ...`` search per 250 IDs (the API page size limit)
+        instead of one request per card, and each card is cached individually
+        so later get_card_by_id calls hit. Cards already being fetched are
+        awaited rather than fetched again, and concurrent get_card_by_id calls
+        join the batch.
+        
+        Args:
+            card_ids: Unique card IDs (e.g., ["base1-25", "xy1-1"])
+            
+        Returns:
+            Mapping of card ID to card data in the get_card_by_id response shape;
+            IDs the API does not know are omitted
+        """
+        unique_ids = list(dict.fromkeys(card_ids))
+        results: Dict[str, Dict[str, Any]] = {}
+        memory_misses: List[str] = []
+        for card_id in unique_ids:
+            cached_data = self._get_from_cache(self._card_cache_key(card_id))
+            if cached_data is not None:
+                results[card_id] = cached_data
+            else:
+                memory_misses.append(card_id)
+        
+        disk_hits: List[Optional[Dict[str, Any]]] = [None] * len(memory_misses)
+        if memory_misses and self._disk is not None:
+            disk_hits = await asyncio.gather(*(
+                self._disk.get(repr(self._card_cache_key(card_id))) for card_id in memory_misses
+            ))
+        
+        misses: List[str] = []
+        joined: Dict[str, asyncio.Future] = {}
+        for card_id, cached_data in zip(memory_misses, disk_hits):
+            cache_key = self._card_cache_key(card_id)
+            if cached_data is not None:
+                self._add_to_cache(cache_key, cached_data)
+                results[card_id] = cached_data
+            elif cache_key in self._inflight:
+                # Already being fetched by get_card_by_id or another batch
+                joined[card_id] = self._inflight[cache_key]
+            else:
+                misses.append(card_id)
+        
+        if misses:
+            logger.info("🔍 Fetching %d of %d cards from API", len(misses), len(unique_ids))
+        
+        loop = asyncio.get_running_loop()
+        for start in range(0, len(misses), 250):
+            batch = misses[start:start + 250]
+            # Register each card as in flight so concurrent lookups join this batch
+            for card_id in batch:
+                self._inflight[self._card_cache_key(card_id)] = loop.create_future()
+            # Shielded like _fetch_and_cache so a cancelled caller spares the waiters
+            results.update(await asyncio.shield(loop.create_task(self._fetch_batch(batch))))
+        
+        for card_id, future in joined.items():
+            data = await asyncio.shield(future)
+            if data.get("data"):
+                results[card_id] = data
+        
+        return results
+
+    async def _fetch_batch(self, batch: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Body of the in-flight task started by get_cards_by_ids for one batch."""
+        cache_keys = {card_id: self._card_cache_key(card_id) for card_id in batch}
+        futures = {card_id: self._inflight[cache_key] for card_id, cache_key in cache_keys.items()}
+        params = (
+            ("q", " OR ".join(f"id:{card_id}" for card_id in batch)),
+            ("pageSize", 250),
+        )
+        try:
+            response = await self._make_request("GET", _CARDS_ENDPOINT, params=params)
+        except asyncio.CancelledError:
+            for future in futures.values():
+                future.cancel()
+            raise
+        except Exception as e:
+            for future in futures.values():
+                future.set_exception(e)
+                # Mark retrieved so asyncio doesn't warn when nobody joined
+                future.exception()
+            raise
+        finally:
+            for cache_key in cache_keys.values():
+                del self._inflight[cache_key]
+        
+        found: Dict[str, Dict[str, Any]] = {}
+        for card in response.get("data", []):
+            data = {"data": card}
+            cache_key = cache_keys.get(card["id"]) or self._card_cache_key(card["id"])
+            self._add_to_cache(cache_key, data)
+            if self._disk is not None:
+                self._disk.set(repr(cache_key), data, self.cache_ttl)
+            found[card["id"]] = data
+        
+        # Joined single-card lookups get the API's not-found response for omitted IDs
+        for card_id, future in futures.items():
+            future.set_result(found.get(card_id, {"data": [], "totalCount": 0}))
+        return found
+
+    def _card_cache_key(self, card_id: str) -> Tuple:
+        """Cache key used for a full single-card response."""
+        return self._get_cache_key(sys.intern(f"{_CARDS_ENDPOINT}/{card_id}"))
+
     def clear_cache(self) -> None:
         """Clear all cached data."""
         self.cache.clear()
@@ -363,33 +773,28 @@ class PokemonTcgClient:
 
     def get_cache_stats(self) -> Dict[str, Any]:
         """Get cache statistics."""
-        current_time = time.time()
-        active_entries = sum(
-            1 for entry in self.cache.values() 
-            if entry["expires_at"] > current_time
-        )
+        cache = self.cache
+        now = time.monotonic()
+        active_entries = 0
+        for expires_at, _ in cache.values():
+            if expires_at > now:
+                active_entries += 1
         
         return {
-            "total_entries": len(self.cache),
+            "total_entries": len(cache),
             "active_entries": active_entries,
-            "expired_entries": len(self.cache) - active_entries,
+            "expired_entries": len(cache) - active_entries,
             "cache_ttl_seconds": self.cache_ttl,
         }
     
     def get_rate_limit_stats(self) -> Dict[str, Any]:
         """Get rate limiting statistics."""
-        now = time.time()
-        hour_ago = now - 3600
-        
-        # Count requests in the last hour
-        recent_requests = [
-            ts for ts in self.request_timestamps if ts > hour_ago
-        ]
+        remaining_requests = int(self._refill_tokens())
         
         return {
-            "requests_last_hour": len(recent_requests),
+            "requests_last_hour": self.rate_limit - remaining_requests,
             "rate_limit": self.rate_limit,
-            "remaining_requests": max(0, self.rate_limit - len(recent_requests)),
+            "remaining_requests": remaining_requests,
         }
     
     def _map_set_name(self, set_name: Optional[str]) -> Optional[str]:
@@ -404,19 +809,12 @@ class PokemonTcgClient:
         """
         if not set_name:
             return set_name
-            
-        # Check direct mapping first
-        if set_name in self.SET_NAME_MAPPINGS:
-            mapped_name = self.SET_NAME_MAPPINGS[set_name]
-            logger.info(f"🗺️ Mapped set name: '{set_name}' → '{mapped_name}'")
+
+        mapped_name = _lookup_set_name(set_name)
+        if mapped_name is not None:
+            logger.info("🗺️ Mapped set name: '%s' → '%s'", set_name, mapped_name)
             return mapped_name
-        
-        # Check case-insensitive mapping
-        for gemini_name, tcg_name in self.SET_NAME_MAPPINGS.items():
-            if set_name.lower() == gemini_name.lower():
-                logger.info(f"🗺️ Mapped set name (case-insensitive): '{set_name}' → '{tcg_name}'")
-                return tcg_name
-        
+
         # No mapping found, return original
         return set_name
     
@@ -432,213 +830,274 @@ class PokemonTcgClient:
         """
         if not name:
             return name
+
+        normalized_name, steps = _normalize_name(name)
+        for message, before, after in steps:
+            logger.info(message, before, after)
+
+        return normalized_name
+    
+    def _normalize_card_number(self, number: Optional[str]) -> Optional[str]:
+        """
+        Normalize card numbers to handle common variations while preserving variant suffixes.
         
-        original_name = name
-        
-        # Handle international name translations (common Gemini mistakes)
-        name_translations = {
-            # French names that Gemini sometimes outputs
-            "Goupix": "Vulpix",
-            "Reptincel": "Charmeleon", 
-            "Dracaufeu": "Charizard",
-            "Carapuce": "Squirtle",
-            "Carabaffe": "Wartortle",
-            "Tortank": "Blastoise",
-            "Chenipan": "Caterpie",
-            "Chrysacier": "Metapod",
-            "Papilusion": "Butterfree",
-            "Aspicot": "Weedle",
-            "Coconfort": "Kakuna",
-            "Dardargnan": "Beedrill",
-            "Roucool": "Pidgey",
-            "Roucoups": "Pidgeotto",
-            "Roucarnage": "Pidgeot",
-            "Rattata": "Rattata",  # Same in French
-            "Rattatac": "Raticate",
-            "Piafabec": "Spearow",
-            "Rapasdepic": "Fearow",
-            "Abo": "Ekans",
-            "Arbok": "Arbok",  # Same in French
-            "Pikachu": "Pikachu",  # Same in French
-            "Raichu": "Raichu",  # Same in French
-            # Japanese names (less common but possible)
-            "フシギダネ": "Bulbasaur",
-            "フシギソウ": "Ivysaur", 
-            "フシギバナ": "Venusaur",
-            "ヒトカゲ": "Charmander",
-            "リザード": "Charmeleon",
-            "リザードン": "Charizard",
-            "ゼニガメ": "Squirtle",
-            "カメール": "Wartortle",
-            "カメックス": "Blastoise",
-            "ピカチュウ": "Pikachu",
-            "ライチュウ": "Raichu",
-        }
-        
-        # Check for direct translation
-        if name in name_translations:
-            name = name_translations[name]
-            logger.info(f"🌍 Translated Pokemon name: '{original_name}' → '{name}'")
-        
-        # Handle apostrophe variations (comprehensive fix)
-        import re
-        
-        # Normalize apostrophe characters first (ASCII vs Unicode)
-        name = re.sub(r'[''`]', "'", name)
-        
-        # Pokemon names that should have apostrophes
-        pokemon_apostrophes = {
-            'farfetchd': "Farfetch'd",
-            'farfetch d': "Farfetch'd",
-            'sirfetchd': "Sirfetch'd", 
-            'sirfetch d': "Sirfetch'd",
-        }
-        
+        Args:
+            number: Card number from Gemini output (e.g., "177a/168", "060b", "25")
+            
+        Returns:
+            Normalized number for better matching (e.g., "177a", "60b", "25")
+        """
+        if not number:
+            return number
+
+        normalized_number = _normalize_number(number)
+        if normalized_number != number:
+            logger.info("🔢 Normalized card number: '%s' → '%s'", number, normalized_number)
+
+        return normalized_number
+
+
+async def close_tcg_clients() -> None:
+    """Flush disk caches and close the shared HTTP clients of every account."""
+    for state in _SHARED_STATES.values():
+        if state.disk is not None:
+            await state.disk.flush()
+        clients = list(state.http_clients.values())
+        state.http_clients.clear()
+        for client in clients:
+            await client.aclose()
+
+
+def _create_aiohttp_session() -> "aiohttp.ClientSession":
+    """
+    Build the session behind the aiohttp transport.
+    
+    Called lazily by the transport inside the running loop. Caches DNS lookups
+    for api.pokemontcg.io and resolves through aiodns when it is installed,
+    instead of aiohttp's default thread-pool getaddrinfo.
+    """
+    connector = aiohttp.TCPConnector(
+        limit=_MAX_CONNECTIONS,
+        keepalive_timeout=_KEEPALIVE_EXPIRY,
+        ttl_dns_cache=300,
+        resolver=aiohttp.AsyncResolver() if AIODNS_SUPPORTED else None,
+    )
+    return aiohttp.ClientSession(connector=connector)
+
+
+def _project_card(response: Dict[str, Any], fields: Tuple[str, ...]) -> Dict[str, Any]:
+    """Keep only the requested top-level fields of a single-card response."""
+    card = response.get("data") or {}
+    return {**response, "data": {field: card[field] for field in fields if field in card}}
+
+
+@lru_cache(maxsize=1024)
+def _lookup_set_name(set_name: str) -> Optional[str]:
+    """Resolve a set name against SET_NAME_MAPPINGS, or None if it has no mapping."""
+    return PokemonTcgClient.SET_NAME_MAPPINGS_CI.get(set_name.lower())
+
+
+# Pokemon names that should have apostrophes
+_POKEMON_APOSTROPHES = {
+    'farfetchd': "Farfetch'd",
+    'farfetch d': "Farfetch'd",
+    'sirfetchd': "Sirfetch'd", 
+    'sirfetch d': "Sirfetch'd",
+}
+
+# Known trainer names that should have apostrophes (comprehensive list)
+_TRAINER_POSSESSIVES = {
+    'team rockets': "Team Rocket's",
+    'team rocket s': "Team Rocket's", 
+    'brocks': "Brock's",
+    'brock s': "Brock's",
+    'mistys': "Misty's", 
+    'misty s': "Misty's",
+    'giovannis': "Giovanni's",
+    'giovanni s': "Giovanni's",
+    'lt surges': "Lt. Surge's",
+    'lt surge s': "Lt. Surge's",
+    'lieutenant surges': "Lt. Surge's",
+    'erikas': "Erika's",
+    'erika s': "Erika's",
+    'kogas': "Koga's",
+    'koga s': "Koga's",
+    'sabrinas': "Sabrina's",
+    'sabrina s': "Sabrina's",
+    'blaines': "Blaine's",
+    'blaine s': "Blaine's",
+    'blues': "Blue's",
+    'blue s': "Blue's",
+    'reds': "Red's",
+    'red s': "Red's",
+    'greens': "Green's",
+    'green s': "Green's",
+    'bills': "Bill's",
+    'bill s': "Bill's",
+    'professor oaks': "Professor Oak's",
+    'professor oak s': "Professor Oak's",
+    'professor elms': "Professor Elm's",
+    'professor elm s': "Professor Elm's",
+    'professor birches': "Professor Birch's",
+    'professor birch s': "Professor Birch's",
+    'professor rowans': "Professor Rowan's",
+    'professor rowan s': "Professor Rowan's",
+    'professor junipers': "Professor Juniper's",
+    'professor juniper s': "Professor Juniper's",
+    'professor sycamores': "Professor Sycamore's",
+    'professor sycamore s': "Professor Sycamore's",
+    'professor kukuis': "Professor Kukui's",
+    'professor kukui s': "Professor Kukui's",
+    'professor magnolias': "Professor Magnolia's",
+    'professor magnolia s': "Professor Magnolia's",
+    'lysandres': "Lysandre's",
+    'lysandre s': "Lysandre's",
+    'flannery s': "Flannery's",
+    'winona s': "Winona's",
+    'norman s': "Norman's",
+    'watson s': "Wattson's",
+    'roxanne s': "Roxanne's",
+}
+
+# Leading zeros of a card number, keeping at least one digit ("000" -> "0")
+_LEADING_ZEROS_RE = re.compile(r"^0+(?=\d)")
+
+# " GX"/" EX" suffixes that the TCG API spells with a hyphen
+_GX_EX_RE = re.compile(r" (GX|EX)")
+
+# Every fragment that can trigger an apostrophe fix, matched in one regex scan
+_APOSTROPHE_TRIGGERS = frozenset(_POKEMON_APOSTROPHES) | frozenset(_TRAINER_POSSESSIVES)
+_APOSTROPHE_TRIGGER_RE = re.compile(
+    "|".join(re.escape(trigger) for trigger in sorted(_APOSTROPHE_TRIGGERS))
+)
+
+
+@lru_cache(maxsize=1024)
+def _normalize_name(name: str) -> Tuple[str, Tuple[Tuple[str, str, str], ...]]:
+    """
+    Pure implementation of PokemonTcgClient._normalize_pokemon_name.
+    
+    Returns the normalized name and the (log message, before, after) steps that
+    changed it; the uncached caller logs those so they appear on every call.
+    """
+    original_name = name
+    steps: List[Tuple[str, str, str]] = []
+
+    # Handle international name translations (common Gemini mistakes)
+    name_translations = {
+        # French names that Gemini sometimes outputs
+        "Goupix": "Vulpix",
+        "Reptincel": "Charmeleon", 
+        "Dracaufeu": "Charizard",
+        "Carapuce": "Squirtle",
+        "Carabaffe": "Wartortle",
+        "Tortank": "Blastoise",
+        "Chenipan": "Caterpie",
+        "Chrysacier": "Metapod",
+        "Papilusion": "Butterfree",
+        "Aspicot": "Weedle",
+        "Coconfort": "Kakuna",
+        "Dardargnan": "Beedrill",
+        "Roucool": "Pidgey",
+        "Roucoups": "Pidgeotto",
+        "Roucarnage": "Pidgeot",
+        "Rattata": "Rattata",  # Same in French
+        "Rattatac": "Raticate",
+        "Piafabec": "Spearow",
+        "Rapasdepic": "Fearow",
+        "Abo": "Ekans",
+        "Arbok": "Arbok",  # Same in French
+        "Pikachu": "Pikachu",  # Same in French
+        "Raichu": "Raichu",  # Same in French
+        # Japanese names (less common but possible)
+        "フシギダネ": "Bulbasaur",
+        "フシギソウ": "Ivysaur", 
+        "フシギバナ": "Venusaur",
+        "ヒトカゲ": "Charmander",
+        "リザード": "Charmeleon",
+        "リザードン": "Charizard",
+        "ゼニガメ": "Squirtle",
+        "カメール": "Wartortle",
+        "カメックス": "Blastoise",
+        "ピカチュウ": "Pikachu",
+        "ライチュウ": "Raichu",
+    }
+
+    # Check for direct translation
+    if name in name_translations:
+        name = name_translations[name]
+        steps.append(("🌍 Translated Pokemon name: '%s' → '%s'", original_name, name))
+
+    # Handle apostrophe variations (comprehensive fix)
+    # Normalize apostrophe characters first (ASCII vs Unicode)
+    name = re.sub(r'[''`]', "'", name)
+
+    # Most names contain none of the known fragments, so skip both loops
+    # unless a single scan finds at least one of them
+    name_lower = name.lower()
+    if _APOSTROPHE_TRIGGER_RE.search(name_lower):
         # Apply Pokemon apostrophe fixes first
-        name_lower = name.lower()
-        for incorrect, correct in pokemon_apostrophes.items():
+        for incorrect, correct in _POKEMON_APOSTROPHES.items():
             if incorrect in name_lower:
                 # Use word boundaries to avoid partial matches
                 pattern = r'\b' + re.escape(incorrect) + r'\b'
                 name = re.sub(pattern, correct, name, flags=re.IGNORECASE)
                 break
-        
-        # Known trainer names that should have apostrophes (comprehensive list)
-        trainer_possessives = {
-            'team rockets': "Team Rocket's",
-            'team rocket s': "Team Rocket's", 
-            'brocks': "Brock's",
-            'brock s': "Brock's",
-            'mistys': "Misty's", 
-            'misty s': "Misty's",
-            'giovannis': "Giovanni's",
-            'giovanni s': "Giovanni's",
-            'lt surges': "Lt. Surge's",
-            'lt surge s': "Lt. Surge's",
-            'lieutenant surges': "Lt. Surge's",
-            'erikas': "Erika's",
-            'erika s': "Erika's",
-            'kogas': "Koga's",
-            'koga s': "Koga's",
-            'sabrinas': "Sabrina's",
-            'sabrina s': "Sabrina's",
-            'blaines': "Blaine's",
-            'blaine s': "Blaine's",
-            'blues': "Blue's",
-            'blue s': "Blue's",
-            'reds': "Red's",
-            'red s': "Red's",
-            'greens': "Green's",
-            'green s': "Green's",
-            'bills': "Bill's",
-            'bill s': "Bill's",
-            'professor oaks': "Professor Oak's",
-            'professor oak s': "Professor Oak's",
-            'professor elms': "Professor Elm's",
-            'professor elm s': "Professor Elm's",
-            'professor birches': "Professor Birch's",
-            'professor birch s': "Professor Birch's",
-            'professor rowans': "Professor Rowan's",
-            'professor rowan s': "Professor Rowan's",
-            'professor junipers': "Professor Juniper's",
-            'professor juniper s': "Professor Juniper's",
-            'professor sycamores': "Professor Sycamore's",
-            'professor sycamore s': "Professor Sycamore's",
-            'professor kukuis': "Professor Kukui's",
-            'professor kukui s': "Professor Kukui's",
-            'professor magnolias': "Professor Magnolia's",
-            'professor magnolia s': "Professor Magnolia's",
-            'lysandres': "Lysandre's",
-            'lysandre s': "Lysandre's",
-            'flannery s': "Flannery's",
-            'winona s': "Winona's",
-            'norman s': "Norman's",
-            'watson s': "Wattson's",
-            'roxanne s': "Roxanne's",
-        }
-        
+
         # Apply known trainer name fixes
         name_lower = name.lower()  # Refresh after Pokemon apostrophe fixes
-        for incorrect, correct in trainer_possessives.items():
+        for incorrect, correct in _TRAINER_POSSESSIVES.items():
             if incorrect in name_lower:
                 # Use word boundaries to avoid partial matches
                 pattern = r'\b' + re.escape(incorrect) + r'\b'
                 name = re.sub(pattern, correct, name, flags=re.IGNORECASE)
                 break
-        
-        # General possessive pattern fix for remaining cases
-        # Pattern: Word ending in 's' + space + another word (likely possessive)
-        # "Brocks Scouting" -> "Brock's Scouting"
-        # "Bills PC" -> "Bill's PC" 
-        name = re.sub(r'\b([A-Z][a-z]+?)s\s+([A-Z][a-z]+)', r"\1's \2", name)
-        
-        # Handle cases where space was inserted: "Brock s Scouting" -> "Brock's Scouting"
-        name = re.sub(r'\b([A-Z][a-z]+?)\s+s\s+([A-Z][a-z]+)', r"\1's \2", name)
-        
-        # Handle energy symbol normalization (fix translation dropping symbols)
-        name = _normalize_energy_symbols(name)
-        
-        # Handle GX/EX naming variations
-        # "Espeon GX" -> "Espeon-GX"
-        if " GX" in name:
-            name = name.replace(" GX", "-GX")
-            
-        # "Charizard EX" -> "Charizard-EX"  
-        if " EX" in name:
-            name = name.replace(" EX", "-EX")
-            
-        # "Pikachu V" -> "Pikachu V" (V cards don't use hyphen)
-        # "Charizard VMAX" -> "Charizard VMAX" (VMAX cards don't use hyphen)
-        
-        if name != original_name and name not in name_translations.values():
-            logger.info(f"🔤 Normalized Pokemon name: '{original_name}' → '{name}'")
-            
-        return name
-    
-    def _normalize_card_number(self, number: Optional[str]) -> Optional[str]:
-        """
-        Normalize card numbers to handle common variations while preserving variant suffixes.
-        
-        Args:
-            number: Card number from Gemini output (e.g., "177a/168", "060b", "25")
-            
-        Returns:
-            Normalized number for better matching (e.g., "177a", "60b", "25")
-        """
-        if not number:
-            return number
-            
-        original_number = number
-        
-        # Handle card numbers with set totals (e.g., "177a/168" -> "177a")
-        if "/" in number:
-            # Take the first part before the slash
-            number = number.split("/")[0]
-        
-        # Extract base number and variant suffix using regex
-        match = re.match(r'^(\d+)([a-zA-Z]?)$', number.strip())
-        
-        if match:
-            base_number, variant_suffix = match.groups()
-            
-            # Remove leading zeros from base number but preserve variant suffix
-            normalized_base = str(int(base_number))
-            
-            # Reconstruct with variant suffix
-            number = normalized_base + variant_suffix
-        elif number.isdigit():
-            # Simple numeric case - remove leading zeros
-            number = str(int(number))
-        # If it doesn't match our expected patterns, leave it as-is
-        
-        # Handle special cases where Gemini might miss prefixes
-        # For Hidden Fates Shiny Vault, numbers should have "SV" prefix
-        # But we'll let the search handle this with partial matching
-        
-        if number != original_number:
-            logger.info(f"🔢 Normalized card number: '{original_number}' → '{number}'")
-            
-        return number
+
+    # General possessive pattern fix for remaining cases
+    # Pattern: Word ending in 's' + space + another word (likely possessive)
+    # "Brocks Scouting" -> "Brock's Scouting"
+    # "Bills PC" -> "Bill's PC" 
+    name = re.sub(r'\b([A-Z][a-z]+?)s\s+([A-Z][a-z]+)', r"\1's \2", name)
+
+    # Handle cases where space was inserted: "Brock s Scouting" -> "Brock's Scouting"
+    name = re.sub(r'\b([A-Z][a-z]+?)\s+s\s+([A-Z][a-z]+)', r"\1's \2", name)
+
+    # Handle energy symbol normalization (fix translation dropping symbols)
+    symbol_name = _replace_energy_symbols(name)
+    if symbol_name != name:
+        steps.append(("⚡ Normalized energy symbols: '%s' → '%s'", name, symbol_name))
+        name = symbol_name
+
+    # Handle GX/EX naming variations in a single pass
+    # "Espeon GX" -> "Espeon-GX", "Charizard EX" -> "Charizard-EX"
+    name = _GX_EX_RE.sub(r"-\1", name)
+
+    # "Pikachu V" -> "Pikachu V" (V cards don't use hyphen)
+    # "Charizard VMAX" -> "Charizard VMAX" (VMAX cards don't use hyphen)
+
+    if name != original_name and name not in name_translations.values():
+        steps.append(("🔤 Normalized Pokemon name: '%s' → '%s'", original_name, name))
+
+    return name, tuple(steps)
+
+
+@lru_cache(maxsize=1024)
+def _normalize_number(number: str) -> str:
+    """Pure implementation of PokemonTcgClient._normalize_card_number."""
+    # Handle card numbers with set totals (e.g., "177a/168" -> "177a")
+    if "/" in number:
+        # Take the first part before the slash
+        number = number.split("/")[0]
+
+    # Remove leading zeros from the numeric part, preserving any variant
+    # suffix ("060b" -> "60b") and leaving prefixed numbers ("TG01") as-is
+    number = _LEADING_ZEROS_RE.sub("", number.strip())
+
+    # Handle special cases where Gemini might miss prefixes
+    # For Hidden Fates Shiny Vault, numbers should have "SV" prefix
+    # But we'll let the search handle this with partial matching
+
+    return number
 
 
 def _normalize_energy_symbols(name: str) -> str:
@@ -656,9 +1115,16 @@ def _normalize_energy_symbols(name: str) -> str:
     """
     if not name:
         return name
-        
-    original_name = name
-    
+
+    normalized_name = _replace_energy_symbols(name)
+    if normalized_name != name:
+        logger.info("⚡ Normalized energy symbols: '%s' → '%s'", name, normalized_name)
+
+    return normalized_name
+
+
+def _replace_energy_symbols(name: str) -> str:
+    """Pure implementation of _normalize_energy_symbols."""
     # Energy symbol to type mapping
     energy_symbol_map = {
         '⚡': 'Lightning',
@@ -689,7 +1155,4 @@ def _normalize_energy_symbols(name: str) -> str:
             # Pattern: "⚡" -> "Lightning" (standalone symbol)
             name = name.replace(symbol, energy_type)
     
-    if name != original_name:
-        logger.info(f"⚡ Normalized energy symbols: '{original_name}' → '{name}'")
-    
     return name
\ No newline at end of file
@@ -1,21 +1,275 @@
 """TCG search service for finding Pokemon cards in the TCG database."""
 
+import asyncio
 import logging
-from typing import Any, Dict, List, Optional, Tuple
+import re
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
 
 from ..models.schemas import PokemonCard
 from .card_matcher import get_set_family
 
 logger = logging.getLogger(__name__)
 
+# Phrases that indicate Gemini couldn't identify the set
+_INVALID_SET_PHRASES = (
+    "not visible", "likely", "but", "era", "possibly", "unknown",
+    "can't see", "cannot see", "unclear", "maybe", "appears to be",
+    "looks like", "seems like", "hard to tell", "difficult to see"
+)
+
+# Phrases that indicate Gemini couldn't identify the number
+_INVALID_NUMBER_PHRASES = (
+    "not visible", "unknown", "unclear", "can't see", "cannot see",
+    "hard to tell", "difficult", "n/a", "none", "not found"
+)
+
+# One case-insensitive alternation per phrase list so each check is a single pass
+# over the string. Commas in a set name also indicate descriptive text.
+_INVALID_SET_RE = re.compile(
+    "|".join(map(re.escape, _INVALID_SET_PHRASES + (",",))), re.IGNORECASE
+)
+_INVALID_NUMBER_RE = re.compile(
+    "|".join(map(re.escape, _INVALID_NUMBER_PHRASES)), re.IGNORECASE
+)
+
+# Alphanumeric with optional letters (e.g., "123", "SV001", "177a", "TG12"),
+# plus hyphens for promos (e.g., "SWSH001", "XY-P001"). The lookahead requires
+# at least one digit without a second scan.
+_CARD_NUMBER_RE = re.compile(r'(?=[A-Za-z\-]*\d)[A-Za-z0-9\-]+')
+
+
+async def _gather_or_raise(*aws: Awaitable[Any]) -> List[Any]:
+    """
+    Await all awaitables concurrently and re-raise the first failure.
+
+    Unlike a plain gather, every call finishes before an error propagates, so
+    nothing is left running against the shared client.
+    """
+    outcomes = await asyncio.gather(*aws, return_exceptions=True)
+    for outcome in outcomes:
+        if isinstance(outcome, BaseException):
+            raise outcome
+    return outcomes
+
+
+def _is_valid_set_name(set_name: Optional[str]) -> bool:
+    """Check if set name is valid for TCG API query."""
+    if not set_name or not isinstance(set_name, str):
+        return False
+
+    # Check for overly long descriptions (real set names are typically < 50 chars)
+    if len(set_name) > 50:
+        return False
+
+    # Check for invalid phrases and commas
+    return _INVALID_SET_RE.search(set_name) is None
+
+
+def _is_valid_card_number(number: Optional[str]) -> bool:
+    """Check if card number is valid for TCG API query."""
+    if not number or not isinstance(number, str):
+        return False
+
+    # Remove whitespace
+    number = number.strip()
+
+    # Spaces in the middle indicate descriptive text and fail the match too
+    if not _CARD_NUMBER_RE.fullmatch(number):
+        return False
+
+    # Check for invalid phrases
+    return _INVALID_NUMBER_RE.search(number) is None
+
+
+# Query builders: each returns the search query for its strategy, or None when
+# the parsed data doesn't support it. The query is also recorded in search_attempts.
+
+def _exact_match_query(parsed_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Strategy 1: HIGHEST PRIORITY - Set + Number + Name (exact match)."""
+    set_name, number = parsed_data.get("set_name"), parsed_data.get("number")
+    if not (set_name and number):
+        return None
+
+    set_valid = _is_valid_set_name(set_name)
+    number_valid = _is_valid_card_number(number)
+    if not (set_valid and number_valid):
+        logger.debug("   ⚠️ Strategy 1 skipped: Invalid parameters - Set valid: %s, Number valid: %s", set_valid, number_valid)
+        if not set_valid:
+            logger.info("      Invalid set: '%s'", set_name)
+        if not number_valid:
+            logger.info("      Invalid number: '%s'", number)
+        return None
+
+    return {"name": parsed_data["name"], "set_name": set_name, "number": number}
+
+
+def _cross_set_number_query(parsed_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Strategy 1.25: Cross-set Number + Name (when Gemini gets set wrong but number right)."""
+    number = parsed_data.get("number")
+    if not number:
+        return None
+
+    if not _is_valid_card_number(number):
+        logger.debug("   ⚠️ Strategy 1.25 skipped: Invalid number '%s'", number)
+        return None
+
+    return {"name": parsed_data["name"], "number": number}
+
+
+def _set_family_query(parsed_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Strategy 1.5: Set Family + Number + Name (for cases like "XY" -> "XY BREAKpoint")."""
+    set_name, number = parsed_data.get("set_name"), parsed_data.get("number")
+    if not (set_name and number):
+        return None
+
+    if not _is_valid_card_number(number):
+        logger.debug("   ⚠️ Strategy 1.5 skipped: Invalid number '%s'", number)
+        return None
+
+    set_family = get_set_family(set_name)
+    if not set_family:
+        return None
+
+    logger.info("   📚 Set family contains: %s", set_family)
+    return {"name": parsed_data["name"], "set_family": set_family, "number": number}
+
+
+def _set_name_query(parsed_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Strategy 2: Set + Name (without number constraint)."""
+    set_name = parsed_data.get("set_name")
+    if not set_name:
+        return None
+
+    if not _is_valid_set_name(set_name):
+        logger.debug("   ⚠️ Strategy 2 skipped: Invalid set name '%s'", set_name)
+        return None
+
+    return {"name": parsed_data["name"], "set_name": set_name}
+
+
+def _name_hp_query(parsed_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Strategy 3: Name + HP (cross-set search with HP validation)."""
+    if not parsed_data.get("hp"):
+        return None
+    return {"name": parsed_data["name"], "hp": parsed_data["hp"]}
+
+
+def _hidden_fates_query(parsed_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Strategy 4: Special case for Hidden Fates Shiny Vault numbers."""
+    if parsed_data.get("set_name") != "Hidden Fates" or not parsed_data.get("number"):
+        return None
+    return {
+        "name": parsed_data["name"],
+        "set_name": parsed_data["set_name"],
+        "number": f"SV{parsed_data['number']}",
+    }
+
+
+def _fuzzy_name_query(parsed_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Strategy 5: Fallback - Name only (fuzzy search)."""
+    return {"name": parsed_data["name"]}
+
+
+@dataclass(frozen=True)
+class _SearchStrategy:
+    """One row of the search pipeline: what to query and when it runs."""
+
+    name: str  # recorded as the attempt's "strategy"
+    label: str  # log prefix
+    description: str
+    build_query: Callable[[Dict[str, Any]], Optional[Dict[str, Any]]]
+    page_size: int
+    fuzzy: bool = False
+    # Only run while fewer than this many results exist. None means the strategy
+    # doesn't depend on earlier results, so it is fetched up front, concurrently.
+    run_below: Optional[int] = None
+    # Cap on how many new results the strategy may add
+    max_new_results: Optional[int] = None
+    # Log when the match came from a different set than Gemini reported
+    log_set_correction: bool = False
+    # Record how many new (deduplicated) results were added rather than how
+    # many the API returned
+    count_new_results: bool = False
+
+
+# Search strategies in priority order; results are merged in this order
+_STRATEGIES: Tuple[_SearchStrategy, ...] = (
+    _SearchStrategy(
+        name="set_number_name_exact",
+        label="Strategy 1",
+        description="Set + Number + Name (PRIORITY)",
+        build_query=_exact_match_query,
+        page_size=5,
+    ),
+    _SearchStrategy(
+        name="cross_set_number_name",
+        label="Strategy 1.25",
+        description="Cross-set Number + Name (ignore potentially wrong set)",
+        build_query=_cross_set_number_query,
+        page_size=10,
+        run_below=1,
+        log_set_correction=True,
+    ),
+    _SearchStrategy(
+        name="set_family_number_name",
+        label="Strategy 1.5",
+        description="Set Family expansion",
+        build_query=_set_family_query,
+        page_size=3,
+        run_below=1,
+        count_new_results=True,
+    ),
+    _SearchStrategy(
+        name="set_name_only",
+        label="Strategy 2",
+        description="Set + Name (no number)",
+        build_query=_set_name_query,
+        page_size=10,
+    ),
+    _SearchStrategy(
+        name="name_hp_cross_set",
+        label="Strategy 3",
+        description="Name + HP (cross-set)",
+        build_query=_name_hp_query,
+        page_size=10,
+        run_below=5,
+    ),
+    _SearchStrategy(
+        name="hidden_fates_sv_prefix",
+        label="Strategy 4",
+        description="Hidden Fates with SV prefix",
+        build_query=_hidden_fates_query,
+        page_size=5,
+        run_below=3,
+    ),
+    _SearchStrategy(
+        name="fuzzy_name_only_fallback",
+        label="Strategy 5",
+        description="Fallback name-only (fuzzy)",
+        build_query=_fuzzy_name_query,
+        page_size=15,
+        fuzzy=True,
+        run_below=5,
+        # Limit fallback results to prevent too many fuzzy matches
+        max_new_results=10,
+    ),
+)
+
 
 class TCGSearchService:
     """Service for searching Pokemon cards in the TCG database with multiple strategies."""
 
+    # Validators are module-level so the query builders can share them
+    _is_valid_set_name = staticmethod(_is_valid_set_name)
+    _is_valid_card_number = staticmethod(_is_valid_card_number)
+
     def __init__(self):
         """Initialize the TCG search service."""
         self.search_attempts = []
         self.all_search_results = []
+        self._seen_ids = set()
 
     async def search_for_card(
         self,
@@ -34,372 +288,150 @@ class TCGSearchService:
         """
         self.search_attempts = []
         self.all_search_results = []
-        tcg_matches = []
+        self._seen_ids = set()
 
         if not parsed_data.get("name"):
             logger.info("⚠️ TCG search skipped - no Pokemon name identified")
             return [], [], []
 
-        logger.info(f"🔍 Search parameters: name='{parsed_data.get('name')}', set='{parsed_data.get('set_name')}', number='{parsed_data.get('number')}', hp='{parsed_data.get('hp')}'")
+        logger.info(
+            "🔍 Search parameters: name='%s', set='%s', number='%s', hp='%s'",
+            parsed_data.get("name"), parsed_data.get("set_name"), parsed_data.get("number"), parsed_data.get("hp"),
+        )
 
-        # Execute search strategies in priority order
-        await self._strategy_1_exact_match(parsed_data, tcg_client)
-        await self._strategy_1_25_cross_set_number(parsed_data, tcg_client)
-        await self._strategy_1_5_set_family(parsed_data, tcg_client)
-        await self._strategy_2_set_name_only(parsed_data, tcg_client)
-        await self._strategy_3_name_hp(parsed_data, tcg_client)
-        await self._strategy_4_hidden_fates_special(parsed_data, tcg_client)
-        await self._strategy_5_fuzzy_fallback(parsed_data, tcg_client)
+        await self._run_strategies(parsed_data, tcg_client)
 
         # Log search strategy results
-        strategy_summary = ', '.join([f"{attempt['strategy']}: {attempt['results']}" for attempt in self.search_attempts])
-        logger.debug(f"📊 Search Strategy Summary: {strategy_summary}")
-        logger.info(f"🎯 Total combined search results: {len(self.all_search_results)} cards found")
+        if logger.isEnabledFor(logging.DEBUG):
+            strategy_summary = ', '.join([f"{attempt['strategy']}: {attempt['results']}" for attempt in self.search_attempts])
+            logger.debug("📊 Search Strategy Summary: %s", strategy_summary)
+        logger.info("🎯 Total combined search results: %d cards found", len(self.all_search_results))
 
         # Convert to PokemonCard objects
-        for card_data in self.all_search_results:
-            tcg_matches.append(PokemonCard(
+        tcg_matches = [
+            PokemonCard(
                 id=card_data["id"],
                 name=card_data["name"],
-                set_name=card_data.get("set", {}).get("name"),
+                set_name=(card_data.get("set") or {}).get("name"),
                 number=card_data.get("number"),
                 types=card_data.get("types"),
                 hp=card_data.get("hp"),
                 rarity=card_data.get("rarity"),
                 images=card_data.get("images"),
-                market_prices=card_data.get("tcgplayer", {}).get("prices") if card_data.get("tcgplayer") else None,
-            ))
+                market_prices=tcgplayer.get("prices") if (tcgplayer := card_data.get("tcgplayer")) else None,
+            )
+            for card_data in self.all_search_results
+        ]
 
         return self.all_search_results, self.search_attempts, tcg_matches
 
-    async def _strategy_1_exact_match(self, parsed_data: Dict[str, Any], tcg_client: Any) -> None:
-        """Strategy 1: HIGHEST PRIORITY - Set + Number + Name (exact match)."""
-        if not (parsed_data.get("set_name") and parsed_data.get("number")):
-            return
-
-        set_valid = self._is_valid_set_name(parsed_data.get("set_name"))
-        number_valid = self._is_valid_card_number(parsed_data.get("number"))
-
-        if not (set_valid and number_valid):
-            logger.debug(f"   ⚠️ Strategy 1 skipped: Invalid parameters - Set valid: {set_valid}, Number valid: {number_valid}")
-            if not set_valid:
-                logger.info(f"      Invalid set: '{parsed_data.get('set_name')}'")
-            if not number_valid:
-                logger.info(f"      Invalid number: '{parsed_data.get('number')}'")
-            return
-
-        logger.debug("🎯 Strategy 1: Set + Number + Name (PRIORITY)")
-        logger.info(f"   🔍 Searching for: name='{parsed_data['name']}', set='{parsed_data.get('set_name')}', number='{parsed_data.get('number')}'")
-
-        import time
-        api_start = time.time()
-        results = await tcg_client.search_cards(
-            name=parsed_data["name"],
-            set_name=parsed_data.get("set_name"),
-            number=parsed_data.get("number"),
-            page_size=5,
-            fuzzy=False,
-        )
-        api_time = (time.time() - api_start) * 1000
-        logger.debug(f"   ⏱️ Strategy 1 API call took {api_time:.1f}ms")
-
-        if results.get("data"):
-            self.all_search_results.extend(results["data"])
-            logger.debug(f"✅ Strategy 1 found {len(results['data'])} exact matches")
-            logger.debug(f"   📄 First match: {results['data'][0].get('name')} #{results['data'][0].get('number')} from {results['data'][0].get('set', {}).get('name')}")
+    async def _run_strategies(self, parsed_data: Dict[str, Any], tcg_client: Any) -> None:
+        """Run the strategy table in priority order, merging each strategy's results."""
+        # Strategies that don't depend on earlier results start immediately so their
+        # round-trips overlap with the fallback chain; they still merge in table order
+        prefetched = {}
+        for strategy in _STRATEGIES:
+            if strategy.run_below is None:
+                query = strategy.build_query(parsed_data)
+                if query is not None:
+                    prefetched[strategy.name] = (
+                        query, asyncio.ensure_future(self._fetch(strategy, query, tcg_client))
+                    )
+
+        try:
+            for strategy in _STRATEGIES:
+                if strategy.run_below is None:
+                    if strategy.name not in prefetched:
+                        continue
+                    query, fetch = prefetched[strategy.name]
+                    responses = await fetch
+                else:
+                    if len(self.all_search_results) >= strategy.run_below:
+                        continue
+                    query = strategy.build_query(parsed_data)
+                    if query is None:
+                        continue
+                    responses = await self._fetch(strategy, query, tcg_client)
+
+                self._record(strategy, parsed_data, query, responses)
+        except BaseException:
+            # Don't leave prefetches running against the client, or their errors unretrieved
+            fetches = [fetch for _, fetch in prefetched.values()]
+            for fetch in fetches:
+                fetch.cancel()
+            await asyncio.gather(*fetches, return_exceptions=True)
+            raise
+
+    async def _fetch(self, strategy: _SearchStrategy, query: Dict[str, Any], tcg_client: Any) -> List[Dict[str, Any]]:
+        """Send a strategy's query, fanning out across the set family when it has one."""
+        logger.debug("🔄 %s: %s", strategy.label, strategy.description)
+        logger.info("   🔍 Searching for: %s", query)
+
+        set_family = query.get("set_family")
+        if set_family:
+            # The family sets are independent queries, so issue them together
+            base = {key: value for key, value in query.items() if key != "set_family"}
+            searches = [{**base, "set_name": family_set} for family_set in set_family]
         else:
-            logger.debug("   ❌ Strategy 1: No exact matches found")
-
-        self.search_attempts.append({
-            "strategy": "set_number_name_exact",
-            "query": {
-                "name": parsed_data["name"],
-                "set_name": parsed_data.get("set_name"),
-                "number": parsed_data.get("number"),
-            },
-            "results": len(results.get("data", [])),
-        })
-
-    async def _strategy_1_25_cross_set_number(self, parsed_data: Dict[str, Any], tcg_client: Any) -> None:
-        """Strategy 1.25: Cross-set Number + Name (when Gemini gets set wrong but number right)."""
-        if len(self.all_search_results) > 0 or not (parsed_data.get("number") and parsed_data.get("name")):
-            return
+            searches = [query]
 
-        if not self._is_valid_card_number(parsed_data.get("number")):
-            logger.debug(f"   ⚠️ Strategy 1.25 skipped: Invalid number '{parsed_data.get('number')}'")
-            return
+        api_start = time.monotonic()
+        responses = await _gather_or_raise(*(
+            tcg_client.search_cards(**search, page_size=strategy.page_size, fuzzy=strategy.fuzzy)
+            for search in searches
+        ))
+        logger.debug("   ⏱️ %s API call took %.1fms", strategy.label, (time.monotonic() - api_start) * 1000)
+        return responses
 
-        logger.debug("🔄 Strategy 1.25: Cross-set Number + Name (ignore potentially wrong set)")
-        logger.info(f"   🔍 Searching for: name='{parsed_data['name']}', number='{parsed_data.get('number')}'")
-
-        results = await tcg_client.search_cards(
-            name=parsed_data["name"],
-            number=parsed_data.get("number"),
-            page_size=10,
-            fuzzy=False,
-        )
-
-        if results.get("data"):
-            new_results = self._filter_duplicates(results["data"])
-            self.all_search_results.extend(new_results)
-            logger.debug(f"✅ Strategy 1.25 found {len(new_results)} cross-set matches")
-
-            # Log which set we actually found the card in
-            if new_results:
-                found_set = new_results[0].get("set", {}).get("name", "Unknown")
+    def _record(
+        self,
+        strategy: _SearchStrategy,
+        parsed_data: Dict[str, Any],
+        query: Dict[str, Any],
+        responses: List[Dict[str, Any]],
+    ) -> None:
+        """Merge a strategy's results and record the attempt."""
+        data = [card for response in responses for card in response.get("data") or ()]
+        new_results: List[Dict[str, Any]] = []
+
+        if data:
+            new_results = self._filter_duplicates(data)[:strategy.max_new_results]
+            self._add_results(new_results)
+            logger.debug("✅ %s found %d new matches", strategy.label, len(new_results))
+            if logger.isEnabledFor(logging.INFO):
+                for result in new_results[:3]:  # Log first 3 new matches
+                    logger.info(
+                        "   📄 Found: %s #%s from %s",
+                        result.get("name"), result.get("number"), (result.get("set") or {}).get("name"),
+                    )
+
+            if strategy.log_set_correction and new_results:
+                found_set = (new_results[0].get("set") or {}).get("name", "Unknown")
                 original_set = parsed_data.get("set_name", "Unknown")
                 if found_set != original_set:
-                    logger.info(f"   🎯 Set correction: '{original_set}' → '{found_set}'")
+                    logger.info("   🎯 Set correction: '%s' → '%s'", original_set, found_set)
         else:
-            logger.debug("   ❌ Strategy 1.25: No cross-set matches found")
+            logger.debug("   ❌ %s: No matches found", strategy.label)
 
         self.search_attempts.append({
-            "strategy": "cross_set_number_name",
-            "query": {
-                "name": parsed_data["name"],
-                "number": parsed_data.get("number"),
-            },
-            "results": len(results.get("data", [])),
-        })
-
-    async def _strategy_1_5_set_family(self, parsed_data: Dict[str, Any], tcg_client: Any) -> None:
-        """Strategy 1.5: Set Family + Number + Name (for cases like "XY" -> "XY BREAKpoint")."""
-        if len(self.all_search_results) > 0 or not (parsed_data.get("set_name") and parsed_data.get("number")):
-            return
-
-        if not self._is_valid_card_number(parsed_data.get("number")):
-            logger.debug(f"   ⚠️ Strategy 1.5 skipped: Invalid number '{parsed_data.get('number')}'")
-            return
-
-        set_family = get_set_family(parsed_data.get("set_name"))
-        if not set_family:
-            return
-
-        logger.debug(f"🔄 Strategy 1.5: Set Family expansion for '{parsed_data.get('set_name')}'")
-        logger.info(f"   📚 Set family contains: {set_family}")
-
-        family_results_count = 0
-        for family_set in set_family:
-            logger.info(f"   🔍 Searching in family set: '{family_set}'")
-            results = await tcg_client.search_cards(
-                name=parsed_data["name"],
-                set_name=family_set,
-                number=parsed_data.get("number"),
-                page_size=3,
-                fuzzy=False,
-            )
-
-            if results.get("data"):
-                new_results = self._filter_duplicates(results["data"])
-                self.all_search_results.extend(new_results)
-                family_results_count += len(new_results)
-                logger.debug(f"✅ Strategy 1.5 found {len(new_results)} matches in {family_set}")
-                for result in new_results[:2]:  # Log first 2 matches
-                    logger.info(f"   📄 Found: {result.get('name')} #{result.get('number')} from {result.get('set', {}).get('name')}")
-            else:
-                logger.info(f"   ❌ No matches in '{family_set}'")
-
-        self.search_attempts.append({
-            "strategy": "set_family_number_name",
-            "query": {
-                "name": parsed_data["name"],
-                "set_family": set_family,
-                "number": parsed_data.get("number"),
-            },
-            "results": family_results_count,
-        })
-
-    async def _strategy_2_set_name_only(self, parsed_data: Dict[str, Any], tcg_client: Any) -> None:
-        """Strategy 2: Set + Name (without number constraint)."""
-        if not parsed_data.get("set_name"):
-            return
-
-        if not self._is_valid_set_name(parsed_data.get("set_name")):
-            logger.debug(f"   ⚠️ Strategy 2 skipped: Invalid set name '{parsed_data.get('set_name')}'")
-            return
-
-        logger.debug("🔄 Strategy 2: Set + Name (no number)")
-        logger.info(f"   🔍 Searching for: name='{parsed_data['name']}', set='{parsed_data.get('set_name')}'")
-
-        results = await tcg_client.search_cards(
-            name=parsed_data["name"],
-            set_name=parsed_data.get("set_name"),
-            page_size=10,
-            fuzzy=False,
-        )
-
-        if results.get("data"):
-            new_results = self._filter_duplicates(results["data"])
-            self.all_search_results.extend(new_results)
-            logger.debug(f"✅ Strategy 2 found {len(new_results)} additional matches")
-            for result in new_results[:3]:  # Log first 3 new matches
-                logger.info(f"   📄 Found: {result.get('name')} #{result.get('number')} from {result.get('set', {}).get('name')}")
-        else:
-            logger.debug("   ❌ Strategy 2: No set+name matches found")
-
-        self.search_attempts.append({
-            "strategy": "set_name_only",
-            "query": {
-                "name": parsed_data["name"],
-                "set_name": parsed_data.get("set_name"),
-            },
-            "results": len(results.get("data", [])),
-        })
-
-    async def _strategy_3_name_hp(self, parsed_data: Dict[str, Any], tcg_client: Any) -> None:
-        """Strategy 3: Name + HP (cross-set search with HP validation)."""
-        if not parsed_data.get("hp") or len(self.all_search_results) >= 5:
-            return
-
-        logger.debug("🔄 Strategy 3: Name + HP (cross-set)")
-        results = await tcg_client.search_cards(
-            name=parsed_data["name"],
-            hp=parsed_data.get("hp"),
-            page_size=10,
-            fuzzy=False,
-        )
-
-        if results.get("data"):
-            new_results = self._filter_duplicates(results["data"])
-            self.all_search_results.extend(new_results)
-            logger.debug(f"✅ Strategy 3 found {len(new_results)} HP-matching cards")
-
-        self.search_attempts.append({
-            "strategy": "name_hp_cross_set",
-            "query": {
-                "name": parsed_data["name"],
-                "hp": parsed_data.get("hp"),
-            },
-            "results": len(results.get("data", [])),
-        })
-
-    async def _strategy_4_hidden_fates_special(self, parsed_data: Dict[str, Any], tcg_client: Any) -> None:
-        """Strategy 4: Special case for Hidden Fates Shiny Vault numbers."""
-        if (parsed_data.get("set_name") != "Hidden Fates" or 
-            not parsed_data.get("number") or 
-            len(self.all_search_results) >= 3):
-            return
-
-        logger.debug("🔄 Strategy 4: Hidden Fates with SV prefix")
-        sv_number = f"SV{parsed_data['number']}"
-
-        results = await tcg_client.search_cards(
-            name=parsed_data["name"],
-            set_name=parsed_data.get("set_name"),
-            number=sv_number,
-            page_size=5,
-            fuzzy=False,
-        )
-
-        if results.get("data"):
-            new_results = self._filter_duplicates(results["data"])
-            self.all_search_results.extend(new_results)
-            logger.debug(f"✅ Strategy 4 found {len(new_results)} SV-prefixed cards")
-
-        self.search_attempts.append({
-            "strategy": "hidden_fates_sv_prefix",
-            "query": {
-                "name": parsed_data["name"],
-                "set_name": parsed_data.get("set_name"),
-                "number": sv_number,
-            },
-            "results": len(results.get("data", [])),
-        })
-
-    async def _strategy_5_fuzzy_fallback(self, parsed_data: Dict[str, Any], tcg_client: Any) -> None:
-        """Strategy 5: Fallback - Name only (fuzzy search)."""
-        if len(self.all_search_results) >= 5:
-            return
-
-        logger.debug("🔄 Strategy 5: Fallback name-only (fuzzy)")
-        results = await tcg_client.search_cards(
-            name=parsed_data["name"],
-            page_size=15,
-            fuzzy=True,
-        )
-
-        if results.get("data"):
-            new_results = self._filter_duplicates(results["data"])
-            # Limit fallback results to prevent too many fuzzy matches
-            self.all_search_results.extend(new_results[:10])
-            logger.debug(f"✅ Strategy 5 found {len(new_results[:10])} fallback matches")
-
-        self.search_attempts.append({
-            "strategy": "fuzzy_name_only_fallback",
-            "query": {
-                "name": parsed_data["name"],
-            },
-            "results": len(results.get("data", [])),
+            "strategy": strategy.name,
+            "query": query,
+            "results": len(new_results) if strategy.count_new_results else len(data),
         })
 
     def _filter_duplicates(self, new_results: List[Dict]) -> List[Dict]:
-        """Filter out cards that are already in search results."""
-        return [
-            card for card in new_results
-            if not any(existing["id"] == card["id"] for existing in self.all_search_results)
-        ]
-
-    def _is_valid_set_name(self, set_name: Optional[str]) -> bool:
-        """Check if set name is valid for TCG API query."""
-        if not set_name or not isinstance(set_name, str):
-            return False
-
-        # Invalid phrases that indicate Gemini couldn't identify the set
-        invalid_phrases = [
-            "not visible", "likely", "but", "era", "possibly", "unknown",
-            "can't see", "cannot see", "unclear", "maybe", "appears to be",
-            "looks like", "seems like", "hard to tell", "difficult to see"
-        ]
-
-        set_lower = set_name.lower()
-
-        # Check for invalid phrases
-        if any(phrase in set_lower for phrase in invalid_phrases):
-            return False
-
-        # Check for overly long descriptions (real set names are typically < 50 chars)
-        if len(set_name) > 50:
-            return False
-
-        # Check for commas (indicates descriptive text)
-        if "," in set_name:
-            return False
-
-        return True
-
-    def _is_valid_card_number(self, number: Optional[str]) -> bool:
-        """Check if card number is valid for TCG API query."""
-        import re
-        
-        if not number or not isinstance(number, str):
-            return False
-
-        # Remove whitespace
-        number = number.strip()
-
-        # Invalid phrases that indicate Gemini couldn't identify the number
-        invalid_phrases = [
-            "not visible", "unknown", "unclear", "can't see", "cannot see",
-            "hard to tell", "difficult", "n/a", "none", "not found"
-        ]
-
-        number_lower = number.lower()
-
-        # Check for invalid phrases
-        if any(phrase in number_lower for phrase in invalid_phrases):
-            return False
-
-        # Check for spaces in the middle (indicates descriptive text)
-        if " " in number:
-            return False
-
-        # Allow alphanumeric with optional letters (e.g., "123", "SV001", "177a", "TG12")
-        # Also allow hyphens for promos (e.g., "SWSH001", "XY-P001")
-        if not re.match(r'^[A-Za-z0-9\-]+$', number):
-            return False
-
-        # Must have at least one digit
-        if not any(c.isdigit() for c in number):
-            return False
-
-        return True
\ No newline at end of file
+        """Filter out cards that are already in search results or repeated in new_results."""
+        seen_ids = self._seen_ids
+        batch_ids = set()
+        unique = []
+        for card in new_results:
+            card_id = card["id"]
+            if card_id not in seen_ids and card_id not in batch_ids:
+                batch_ids.add(card_id)
+                unique.append(card)
+        return unique
+
+    def _add_results(self, new_results: List[Dict]) -> None:
+        """Append cards to the search results, keeping the seen-ID index in step."""
+        self.all_search_results.extend(new_results)
+        self._seen_ids.update(card["id"] for card in new_results)
@@ -1,24 +1,73 @@
 """Webhook notification service for error reporting."""
 
+import asyncio
+import contextlib
 import logging
 import time
+from collections import deque
 from datetime import datetime, timezone
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlsplit
 
 import httpx
+import orjson
 
 from ..config import get_config
 
+# HTTP/2 needs the optional h2 package (httpx[http2])
+try:
+    import h2  # noqa: F401
+    HTTP2_SUPPORTED = True
+except ImportError:
+    HTTP2_SUPPORTED = False
+
 logger = logging.getLogger(__name__)
 config = get_config()
 
+# Numeric priority per log level, matching the stdlib logging values
+_LEVEL_PRIORITY = {
+    "DEBUG": 10,
+    "INFO": 20,
+    "WARNING": 30,
+    "ERROR": 40,
+    "CRITICAL": 50,
+}
+
 
 class WebhookService:
     """Service for sending webhook notifications on errors."""
     
+    # Notifications waiting for the background sender before new ones are dropped
+    QUEUE_SIZE = 256
+    # How long the sender waits for more notifications to fill a batch (seconds)
+    BATCH_WINDOW = 0.05
+    
     def __init__(self):
-        self.client = httpx.AsyncClient(timeout=config.error_webhook_timeout)
+        # Keep connections alive so bursts of notifications reuse one TLS session
+        self.client = httpx.AsyncClient(
+            timeout=config.error_webhook_timeout,
+            headers={"Content-Type": "application/json"},
+            http2=HTTP2_SUPPORTED,
+            limits=httpx.Limits(
+                max_keepalive_connections=10,
+                max_connections=20,
+                keepalive_expiry=60.0,
+            ),
+        )
         self._rate_limiter = RateLimiter(config.error_webhook_rate_limit, window=60)
+        
+        # The webhook URL is fixed for the life of the process, so validate it once
+        self._url = config.error_webhook_url
+        self._url_valid = self._is_valid_url(self._url)
+        if self._url and not self._url_valid:
+            logger.error("Invalid webhook URL format: %s...", self._url[:50])
+        
+        self._min_level_value = _LEVEL_PRIORITY.get(config.error_webhook_min_level, 40)
+        
+        # Delivery happens on a background task so error paths never wait on the network
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=self.QUEUE_SIZE)
+        self._worker: Optional[asyncio.Task] = None
+        self._batch_size = max(1, config.error_webhook_batch_size)
     
     async def send_error_notification(
         self,
@@ -31,7 +80,10 @@ class WebhookService:
         context: Optional[Dict[str, Any]] = None,
     ) -> bool:
         """
-        Send error notification to configured webhook.
+        Queue an error notification for the configured webhook.
+        
+        Returns as soon as the notification is queued; a background task
+        posts it. Use flush() to wait for delivery.
         
         Args:
             error_message: The error message
@@ -43,14 +95,9 @@ class WebhookService:
             context: Additional context information
             
         Returns:
-            True if notification was sent successfully, False otherwise
+            True if the notification was queued, False if it was filtered or dropped
         """
-        if not config.error_webhook_enabled or not config.error_webhook_url:
-            return False
-        
-        # Validate webhook URL format
-        if not self._is_valid_url(config.error_webhook_url):
-            logger.error(f"Invalid webhook URL format: {config.error_webhook_url[:50]}...")
+        if not (config.error_webhook_enabled and self._url_valid):
             return False
             
         # Check if level meets minimum threshold
@@ -59,7 +106,7 @@ class WebhookService:
             
         # Check rate limiting
         if not self._rate_limiter.allow_request():
-            logger.warning(f"Webhook notification rate limited for error: {error_message[:100]}...")
+            logger.warning("Webhook notification rate limited for error: %s...", error_message[:100])
             return False
         
         try:
@@ -72,39 +119,104 @@ class WebhookService:
                 traceback=traceback,
                 context=context,
             )
-            
-            # Send webhook notification
+        except Exception as e:
+            logger.error("Failed to build webhook notification: %s", e)
+            return False
+        
+        self._ensure_worker()
+        try:
+            self._queue.put_nowait(payload)
+        except asyncio.QueueFull:
+            logger.warning("Webhook queue full, dropping notification for error: %s...", error_message[:100])
+            return False
+        
+        return True
+    
+    async def flush(self) -> None:
+        """Wait until every queued notification has been delivered."""
+        if not self._queue.empty():
+            self._ensure_worker()
+        await self._queue.join()
+    
+    def _ensure_worker(self) -> None:
+        """Start the background sender on the running loop if it isn't already."""
+        loop = asyncio.get_running_loop()
+        if self._worker is not None and self._worker.get_loop() is loop and not self._worker.done():
+            return
+        
+        if self._worker is not None and self._worker.get_loop() is not loop:
+            # The previous loop is gone; a queue with waiters bound to it can't be reused
+            stale_queue = self._queue
+            self._queue = asyncio.Queue(maxsize=self.QUEUE_SIZE)
+            while not stale_queue.empty():
+                self._queue.put_nowait(stale_queue.get_nowait())
+        
+        self._worker = loop.create_task(self._drain())
+    
+    async def _drain(self) -> None:
+        """Deliver queued notifications until cancelled."""
+        while True:
+            batch = [await self._queue.get()]
+            try:
+                if self._batch_size > 1:
+                    await self._fill_batch(batch)
+                await self._deliver(batch)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+    
+    async def _fill_batch(self, batch: List[Dict[str, Any]]) -> None:
+        """Add queued notifications to batch, briefly waiting for near-simultaneous errors."""
+        while len(batch) < self._batch_size:
+            if not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+                continue
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), self.BATCH_WINDOW))
+            except asyncio.TimeoutError:
+                return
+    
+    async def _deliver(self, batch: List[Dict[str, Any]]) -> bool:
+        """Post notification payloads to the webhook, as one event or an events array."""
+        body = batch[0] if len(batch) == 1 else {"events": batch}
+        try:
+            # Content-Type is set on the client; orjson is much faster than httpx's stdlib json
             response = await self.client.post(
-                config.error_webhook_url,
-                json=payload,
-                headers={"Content-Type": "application/json"},
+                self._url,
+                content=orjson.dumps(body, option=orjson.OPT_NON_STR_KEYS),
             )
             
             if response.status_code == 200:
-                logger.debug(f"Webhook notification sent successfully for error: {error_message[:100]}...")
+                logger.debug(
+                    "Webhook notification sent successfully for error: %s... (%d in request)",
+                    batch[0]["message"][:100], len(batch),
+                )
                 return True
             else:
                 logger.warning(
-                    f"Webhook notification failed with status {response.status_code}: {response.text}"
+                    "Webhook notification failed with status %s: %s", response.status_code, response.text
                 )
                 return False
                 
         except Exception as e:
-            logger.error(f"Failed to send webhook notification: {str(e)}")
+            logger.error("Failed to send webhook notification: %s", e)
+            return False
+    
+    def will_notify(self, level: str, with_traceback: bool = False) -> bool:
+        """
+        Check whether a notification at this level would be sent.
+        
+        Lets callers skip expensive work, like formatting a traceback, for
+        notifications that would be filtered out anyway. Pass with_traceback to
+        also require that tracebacks are included in payloads.
+        """
+        if not (config.error_webhook_enabled and self._url_valid and self._should_notify(level)):
             return False
+        return not with_traceback or bool(config.error_webhook_include_traceback)
     
     def _should_notify(self, level: str) -> bool:
         """Check if the error level meets the minimum threshold."""
-        level_priority = {
-            "DEBUG": 10,
-            "INFO": 20,
-            "WARNING": 30,
-            "ERROR": 40,
-            "CRITICAL": 50,
-        }
-        
-        min_level = config.error_webhook_min_level
-        return level_priority.get(level, 0) >= level_priority.get(min_level, 40)
+        return _LEVEL_PRIORITY.get(level, 0) >= self._min_level_value
     
     def _build_payload(
         self,
@@ -143,32 +255,25 @@ class WebhookService:
         if not url:
             return False
         
-        # Basic URL validation - must start with http:// or https://
-        if not (url.startswith("http://") or url.startswith("https://")):
-            return False
-        
-        # Must have a domain after the protocol
-        if url in ["http://", "https://"]:
-            return False
-        
-        # Check for basic URL structure
+        # Must be http(s) with a domain after the protocol
         try:
-            # Simple validation - split by protocol and check domain exists
-            parts = url.split("://", 1)
-            if len(parts) != 2:
-                return False
-            
-            domain_part = parts[1]
-            # Must have at least a domain
-            if not domain_part or domain_part.startswith("/"):
-                return False
-            
-            return True
-        except Exception:
+            parts = urlsplit(url)
+        except ValueError:
             return False
+        return parts.scheme in ("http", "https") and bool(parts.netloc)
     
-    async def close(self):
-        """Close the HTTP client."""
+    async def close(self, timeout: float = 5.0):
+        """Deliver pending notifications (waiting at most timeout seconds), then close the HTTP client."""
+        worker = self._worker
+        if worker is not None and worker.get_loop() is asyncio.get_running_loop() and not worker.done():
+            try:
+                await asyncio.wait_for(self._queue.join(), timeout)
+            except asyncio.TimeoutError:
+                logger.warning("Dropping %d undelivered webhook notifications on shutdown", self._queue.qsize())
+            worker.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await worker
+        self._worker = None
         await self.client.aclose()
 
 
@@ -185,14 +290,23 @@ class RateLimiter:
         """
         self.max_requests = max_requests
         self.window = window
-        self.requests = []
+        # Monotonic timestamps, oldest on the left
+        self.requests = deque()
     
     def allow_request(self) -> bool:
-        """Check if a request is allowed within the rate limit."""
-        now = time.time()
+        """
+        Check if a request is allowed within the rate limit.
+        
+        Deliberately synchronous: the prune, check and append run without
+        yielding to the event loop, so concurrent error handlers can't
+        interleave and over-admit. Keep it free of awaits.
+        """
+        now = time.monotonic()
         
         # Remove old requests outside the window
-        self.requests = [req_time for req_time in self.requests if now - req_time < self.window]
+        requests = self.requests
+        while requests and now - requests[0] >= self.window:
+            requests.popleft()
         
         # Check if we're under the limit
         if len(self.requests) < self.max_requests:
@@ -214,6 +328,14 @@ def get_webhook_service() -> WebhookService:
     return _webhook_service
 
 
+async def close_webhook_service() -> None:
+    """Flush and close the global webhook service, if it was started."""
+    global _webhook_service
+    if _webhook_service is not None:
+        await _webhook_service.close()
+        _webhook_service = None
+
+
 async def send_error_webhook(
     error_message: str,
     level: str = "ERROR",
@@ -236,7 +358,7 @@ async def send_error_webhook(
         context: Additional context information
         
     Returns:
-        True if notification was sent successfully, False otherwise
+        True if the notification was queued, False if it was filtered or dropped
     """
     webhook_service = get_webhook_service()
     return await webhook_service.send_error_notification(
@@ -1,12 +1,19 @@
 """Cost tracking utilities for Pokemon card scanner API usage."""
 
 import logging
+import time
+from collections import Counter, defaultdict, deque
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Deque, Dict, Optional
 
 logger = logging.getLogger(__name__)
 
 
+def _new_service_totals() -> Dict:
+    """Empty running totals for one service."""
+    return {"count": 0, "total_cost": 0.0, "operations": Counter()}
+
+
 class CostTracker:
     """Track and estimate costs for API operations."""
 
@@ -18,16 +25,46 @@ class CostTracker:
         "image_processing": 0.0025,
     }
 
+    # Per-token and per-image prices derived once from GEMINI_COSTS for the tracking hot path
+    _INPUT_COST_PER_TOKEN = GEMINI_COSTS["input_tokens_per_1k"] / 1000
+    _OUTPUT_COST_PER_TOKEN = GEMINI_COSTS["output_tokens_per_1k"] / 1000
+    _IMAGE_COST = GEMINI_COSTS["image_processing"]
+
+    # estimate_scan_cost results keyed by use_image, shared by all trackers
+    _scan_cost_estimates: Dict[bool, Dict[str, float]] = {}
+
     # Pokemon TCG API is free but has rate limits
     TCG_API_COSTS = {
         "search": 0.0,
         "get_card": 0.0,
     }
 
+    # Most recent usage records kept in session_costs; totals cover the whole session
+    HISTORY_SIZE = 10_000
+
     def __init__(self):
         """Initialize cost tracker with session storage."""
-        self.session_costs: List[Dict] = []
+        # Records carry time.time() epoch floats; building an ISO string per record is wasted work
+        self.session_costs: Deque[Dict] = deque(maxlen=self.HISTORY_SIZE)
         self.session_start = datetime.now()
+        self._session_start_monotonic = time.monotonic()
+
+        # Running totals kept up to date by _record so summaries don't rescan the records
+        self._total_cost = 0.0
+        self._request_count = 0
+        self._by_service = defaultdict(_new_service_totals)
+
+    def _record(self, usage_record: Dict) -> None:
+        """Store a usage record and fold it into the running totals."""
+        self.session_costs.append(usage_record)
+
+        cost = usage_record["cost_usd"]
+        self._total_cost += cost
+        self._request_count += 1
+        entry = self._by_service[usage_record["service"]]
+        entry["count"] += 1
+        entry["total_cost"] += cost
+        entry["operations"][usage_record.get("operation", "unknown")] += 1
 
     def track_gemini_usage(
         self,
@@ -48,22 +85,16 @@ class CostTracker:
         Returns:
             Estimated cost in USD
         """
-        cost = 0.0
-
-        # Token costs
-        if prompt_tokens > 0:
-            cost += (prompt_tokens / 1000) * self.GEMINI_COSTS["input_tokens_per_1k"]
-
-        if response_tokens > 0:
-            cost += (response_tokens / 1000) * self.GEMINI_COSTS["output_tokens_per_1k"]
-
-        # Image processing cost
-        if includes_image:
-            cost += self.GEMINI_COSTS["image_processing"]
+        # Token costs (non-positive counts are ignored) plus image processing cost
+        cost = (
+            (prompt_tokens * self._INPUT_COST_PER_TOKEN if prompt_tokens > 0 else 0.0) +
+            (response_tokens * self._OUTPUT_COST_PER_TOKEN if response_tokens > 0 else 0.0) +
+            (self._IMAGE_COST if includes_image else 0.0)
+        )
 
         # Track the usage
         usage_record = {
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": time.time(),
             "service": "gemini",
             "operation": operation,
             "prompt_tokens": prompt_tokens,
@@ -72,8 +103,8 @@ class CostTracker:
             "cost_usd": cost,
         }
 
-        self.session_costs.append(usage_record)
-        logger.info(f"💰 Gemini API cost: ${cost:.6f} for {operation}")
+        self._record(usage_record)
+        logger.info("💰 Gemini API cost: $%.6f for %s", cost, operation)
 
         return cost
 
@@ -88,13 +119,13 @@ class CostTracker:
             Cost (always 0.0 for TCG API)
         """
         usage_record = {
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": time.time(),
             "service": "tcg_api",
             "operation": operation,
             "cost_usd": 0.0,
         }
 
-        self.session_costs.append(usage_record)
+        self._record(usage_record)
         return 0.0
 
     def get_session_summary(self) -> Dict:
@@ -104,44 +135,37 @@ class CostTracker:
         Returns:
             Dictionary with cost summary
         """
-        total_cost = sum(record["cost_usd"] for record in self.session_costs)
-
-        # Group by service
-        service_costs = {}
-        for record in self.session_costs:
-            service = record["service"]
-            if service not in service_costs:
-                service_costs[service] = {
-                    "count": 0,
-                    "total_cost": 0.0,
-                    "operations": {}
-                }
-
-            service_costs[service]["count"] += 1
-            service_costs[service]["total_cost"] += record["cost_usd"]
-
-            # Track operation counts
-            op = record.get("operation", "unknown")
-            if op not in service_costs[service]["operations"]:
-                service_costs[service]["operations"][op] = 0
-            service_costs[service]["operations"][op] += 1
-
-        session_duration_minutes = max((datetime.now() - self.session_start).total_seconds() / 60, 0.01)  # Minimum 0.01 minutes
+        total_cost = self._total_cost
+        request_count = self._request_count
+
+        # One clock read feeds both the duration and the monthly extrapolation
+        duration_seconds = time.monotonic() - self._session_start_monotonic
+        session_duration_minutes = max(duration_seconds / 60, 0.01)  # Minimum 0.01 minutes
 
         return {
             "session_start": self.session_start.isoformat(),
             "session_duration_minutes": session_duration_minutes,
-            "total_requests": len(self.session_costs),
+            "total_requests": request_count,
             "total_cost_usd": round(total_cost, 6),
-            "estimated_monthly_cost": round(total_cost * 30 * 24 * 60 / session_duration_minutes if self.session_costs else 0, 2),
-            "services": service_costs,
-            "average_cost_per_request": round(total_cost / len(self.session_costs), 6) if self.session_costs else 0,
+            "estimated_monthly_cost": round(total_cost * 30 * 24 * 60 / session_duration_minutes if request_count else 0, 2),
+            "services": {
+                service: {**entry, "operations": dict(entry["operations"])}
+                for service, entry in self._by_service.items()
+            },
+            "average_cost_per_request": round(total_cost / request_count, 6) if request_count else 0,
         }
 
     def reset_session(self):
         """Reset session tracking."""
-        self.session_costs = []
-        self.session_start = datetime.now()
+        # Build the fresh structures first, then swap them in. The attributes are still
+        # bound one at a time; this is safe only because track_* and reset_session never
+        # interleave on the event loop and each request gets its own tracker
+        new_costs = deque(maxlen=self.HISTORY_SIZE)
+        new_by_service = defaultdict(_new_service_totals)
+        (
+            self.session_costs, self._by_service, self._total_cost, self._request_count,
+            self.session_start, self._session_start_monotonic,
+        ) = (new_costs, new_by_service, 0.0, 0, datetime.now(), time.monotonic())
         logger.info("Cost tracking session reset")
 
     def estimate_scan_cost(self, use_image: bool = True) -> Dict[str, float]:
@@ -154,16 +178,27 @@ class CostTracker:
         Returns:
             Dictionary with cost breakdown
         """
+        # Only depends on use_image and the class prices, so compute each variant once
+        use_image = bool(use_image)
+        estimate = self._scan_cost_estimates.get(use_image)
+        if estimate is None:
+            estimate = self._compute_scan_cost(use_image)
+            self._scan_cost_estimates[use_image] = estimate
+        return dict(estimate)
+
+    @classmethod
+    def _compute_scan_cost(cls, use_image: bool) -> Dict[str, float]:
+        """Build the cost breakdown returned by estimate_scan_cost."""
         # Typical token usage for Pokemon card identification
         avg_prompt_tokens = 150 if not use_image else 50  # Less tokens needed with image
         avg_response_tokens = 300  # Typical response length
 
         token_cost = (
-            (avg_prompt_tokens / 1000) * self.GEMINI_COSTS["input_tokens_per_1k"] +
-            (avg_response_tokens / 1000) * self.GEMINI_COSTS["output_tokens_per_1k"]
+            (avg_prompt_tokens / 1000) * cls.GEMINI_COSTS["input_tokens_per_1k"] +
+            (avg_response_tokens / 1000) * cls.GEMINI_COSTS["output_tokens_per_1k"]
         )
 
-        image_cost = self.GEMINI_COSTS["image_processing"] if use_image else 0.0
+        image_cost = cls.GEMINI_COSTS["image_processing"] if use_image else 0.0
 
         return {
             "token_cost": round(token_cost, 6),
@@ -16,153 +16,168 @@ Prerequisites:
 
 import asyncio
 import base64
-import json
 import sys
 from pathlib import Path
 
 import aiohttp
+import orjson
+
+SCAN_URL = "http://localhost:8000/api/v1/scan"
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+
+# 1x1 pixel PNG image, encoded once at import
+_TEST_IMAGE_B64 = base64.b64encode(bytes([
+    137, 80, 78, 71, 13, 10, 26, 10, 0, 0, 0, 13, 73, 72, 68, 82, 0, 0, 0, 1, 0, 0, 0, 1, 8, 2, 0, 0, 0, 144, 119, 83, 222, 0, 0, 0, 12, 73, 68, 65, 84, 8, 215, 99, 248, 15, 0, 0, 1, 0, 1, 0, 24, 221, 219, 219, 0, 0, 0, 0, 73, 69, 78, 68, 174, 66, 96, 130
+])).decode('ascii')
 
 
 def create_test_image() -> str:
-    """Create a small test image as base64 for testing."""
-    # 1x1 pixel PNG image
-    tiny_png = bytes([
-        137, 80, 78, 71, 13, 10, 26, 10, 0, 0, 0, 13, 73, 72, 68, 82, 0, 0, 0, 1, 0, 0, 0, 1, 8, 2, 0, 0, 0, 144, 119, 83, 222, 0, 0, 0, 12, 73, 68, 65, 84, 8, 215, 99, 248, 15, 0, 0, 1, 0, 1, 0, 24, 221, 219, 219, 0, 0, 0, 0, 73, 69, 78, 68, 174, 66, 96, 130
-    ])
-    return base64.b64encode(tiny_png).decode('utf-8')
+    """Return a small test image as base64 for testing."""
+    return _TEST_IMAGE_B64
 
 
-async def test_invalid_image():
+async def test_invalid_image(session: aiohttp.ClientSession):
     """Test invalid base64 image data."""
     print("🧪 Testing invalid image data...")
     
-    async with aiohttp.ClientSession() as session:
-        request_data = {
-            "image": "invalid_base64_data",
-            "filename": "test_invalid.jpg",
-            "options": {}
-        }
-        
-        try:
-            async with session.post("http://localhost:8000/api/v1/scan", json=request_data) as response:
-                result = await response.json()
-                print(f"   📤 Response: {response.status} - {result.get('detail', 'No detail')}")
-        except Exception as e:
-            print(f"   ❌ Request failed: {e}")
+    request_data = {
+        "image": "invalid_base64_data",
+        "filename": "test_invalid.jpg",
+        "options": {}
+    }
+    
+    try:
+        async with session.post(SCAN_URL, data=orjson.dumps(request_data), headers=JSON_HEADERS) as response:
+            result = orjson.loads(await response.read())
+            print(f"   📤 Response: {response.status} - {result.get('detail', 'No detail')}")
+    except Exception as e:
+        print(f"   ❌ Request failed: {e}")
 
 
-async def test_processing_error():
+async def test_processing_error(session: aiohttp.ClientSession):
     """Test with a valid image that should trigger processing errors."""
     print("🧪 Testing processing error...")
     
     # Use tiny image that will likely fail quality checks
     test_image = create_test_image()
     
-    async with aiohttp.ClientSession() as session:
-        request_data = {
-            "image": test_image,
-            "filename": "test_tiny.png",
-            "options": {
-                "optimize_for_speed": False,
-                "include_cost_tracking": True
-            }
+    request_data = {
+        "image": test_image,
+        "filename": "test_tiny.png",
+        "options": {
+            "optimize_for_speed": False,
+            "include_cost_tracking": True
         }
-        
-        try:
-            async with session.post("http://localhost:8000/api/v1/scan", json=request_data) as response:
-                result = await response.json()
-                print(f"   📤 Response: {response.status} - {result.get('detail', result.get('error', 'Success'))}")
-        except Exception as e:
-            print(f"   ❌ Request failed: {e}")
+    }
+    
+    try:
+        async with session.post(SCAN_URL, data=orjson.dumps(request_data), headers=JSON_HEADERS) as response:
+            result = orjson.loads(await response.read())
+            print(f"   📤 Response: {response.status} - {result.get('detail', result.get('error', 'Success'))}")
+    except Exception as e:
+        print(f"   ❌ Request failed: {e}")
 
 
-async def test_api_health():
+async def test_api_health(session: aiohttp.ClientSession):
     """Test API health to make sure it's running."""
     print("🔍 Checking API health...")
     
-    async with aiohttp.ClientSession() as session:
-        try:
-            async with session.get("http://localhost:8000/api/v1/health") as response:
-                if response.status == 200:
-                    print("   ✅ API is running")
-                    return True
-                else:
-                    print(f"   ❌ API health check failed: {response.status}")
-                    return False
-        except Exception as e:
-            print(f"   ❌ Cannot connect to API: {e}")
-            return False
-
-
-async def test_webhook_server():
+    try:
+        async with session.get("http://localhost:8000/api/v1/health") as response:
+            if response.status == 200:
+                print("   ✅ API is running")
+                return True
+            else:
+                print(f"   ❌ API health check failed: {response.status}")
+                return False
+    except Exception as e:
+        print(f"   ❌ Cannot connect to API: {e}")
+        return False
+
+
+async def test_webhook_server(session: aiohttp.ClientSession):
     """Test if webhook server is running."""
     print("🔍 Checking webhook server...")
     
-    async with aiohttp.ClientSession() as session:
-        try:
-            async with session.get("http://localhost:3000/health") as response:
-                if response.status == 200:
-                    data = await response.json()
-                    print(f"   ✅ Webhook server is running (received {data.get('webhooks_received', 0)} webhooks)")
-                    return True
-                else:
-                    print(f"   ❌ Webhook server health check failed: {response.status}")
-                    return False
-        except Exception as e:
-            print(f"   ❌ Cannot connect to webhook server: {e}")
-            return False
-
-
-async def trigger_multiple_errors():
+    try:
+        async with session.get("http://localhost:3000/health") as response:
+            if response.status == 200:
+                data = orjson.loads(await response.read())
+                print(f"   ✅ Webhook server is running (received {data.get('webhooks_received', 0)} webhooks)")
+                return True
+            else:
+                print(f"   ❌ Webhook server health check failed: {response.status}")
+                return False
+    except Exception as e:
+        print(f"   ❌ Cannot connect to webhook server: {e}")
+        return False
+
+
+async def trigger_multiple_errors(session: aiohttp.ClientSession):
     """Trigger multiple errors to test rate limiting and different error types."""
     print("🧪 Testing multiple errors (rate limiting)...")
     
-    test_image = create_test_image()
+    # Every request carries the same image and options; only the filename varies
+    base_request = {
+        "image": create_test_image(),
+        "options": {}
+    }
     
-    async with aiohttp.ClientSession() as session:
-        tasks = []
-        
-        for i in range(3):  # Trigger 3 errors quickly
-            request_data = {
-                "image": test_image,
-                "filename": f"test_batch_{i}.png",
-                "options": {}
-            }
-            
-            task = session.post("http://localhost:8000/api/v1/scan", json=request_data)
-            tasks.append(task)
-        
-        # Execute all requests concurrently
-        try:
-            responses = await asyncio.gather(*tasks, return_exceptions=True)
-            for i, response in enumerate(responses):
-                if isinstance(response, Exception):
-                    print(f"   ❌ Request {i+1} failed: {response}")
-                else:
-                    async with response:
-                        result = await response.json()
-                        print(f"   📤 Request {i+1}: {response.status}")
-        except Exception as e:
-            print(f"   ❌ Batch request failed: {e}")
-
-
-async def check_webhook_stats():
+    async def post_scan(i: int) -> int:
+        request_data = {**base_request, "filename": f"test_batch_{i}.png"}
+        async with session.post(SCAN_URL, data=orjson.dumps(request_data), headers=JSON_HEADERS) as response:
+            await response.read()
+            return response.status
+    
+    # Execute all requests concurrently
+    statuses = await asyncio.gather(*(post_scan(i) for i in range(3)), return_exceptions=True)  # Trigger 3 errors quickly
+    for i, status in enumerate(statuses):
+        if isinstance(status, Exception):
+            print(f"   ❌ Request {i+1} failed: {status}")
+        else:
+            print(f"   📤 Request {i+1}: {status}")
+
+
+async def get_webhook_count(session: aiohttp.ClientSession) -> int:
+    """Return how many webhooks the fake server has received, or -1 if it can't be reached."""
+    try:
+        async with session.get("http://localhost:3000/stats") as response:
+            if response.status != 200:
+                return -1
+            data = orjson.loads(await response.read())
+            return data.get('total_webhooks', 0)
+    except Exception:
+        return -1
+
+
+async def wait_for_webhooks(session: aiohttp.ClientSession, target: int, timeout: float) -> None:
+    """Poll the fake server until it has received target webhooks or timeout seconds pass."""
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while loop.time() < deadline:
+        count = await get_webhook_count(session)
+        if count < 0 or count >= target:
+            return
+        await asyncio.sleep(0.05)
+
+
+async def check_webhook_stats(session: aiohttp.ClientSession):
     """Check webhook server statistics."""
     print("📊 Checking webhook statistics...")
     
-    async with aiohttp.ClientSession() as session:
-        try:
-            async with session.get("http://localhost:3000/stats") as response:
-                if response.status == 200:
-                    data = await response.json()
-                    print(f"   📈 Total webhooks: {data.get('total_webhooks', 0)}")
-                    by_level = data.get('by_level', {})
-                    for level, count in by_level.items():
-                        print(f"      {level}: {count}")
-                else:
-                    print(f"   ❌ Failed to get stats: {response.status}")
-        except Exception as e:
-            print(f"   ❌ Cannot get webhook stats: {e}")
+    try:
+        async with session.get("http://localhost:3000/stats") as response:
+            if response.status == 200:
+                data = orjson.loads(await response.read())
+                print(f"   📈 Total webhooks: {data.get('total_webhooks', 0)}")
+                by_level = data.get('by_level', {})
+                for level, count in by_level.items():
+                    print(f"      {level}: {count}")
+            else:
+                print(f"   ❌ Failed to get stats: {response.status}")
+    except Exception as e:
+        print(f"   ❌ Cannot get webhook stats: {e}")
 
 
 def print_instructions():
@@ -186,9 +201,16 @@ async def main():
     print("🚀 Pokemon Card Scanner Webhook Test")
     print("=" * 50)
     
+    # One session for the whole run so connections to both servers are reused
+    async with aiohttp.ClientSession() as session:
+        await run_tests(session)
+
+
+async def run_tests(session: aiohttp.ClientSession):
+    """Check both services, then run the error scenarios."""
     # Check if both services are running
-    api_running = await test_api_health()
-    webhook_running = await test_webhook_server()
+    api_running = await test_api_health(session)
+    webhook_running = await test_webhook_server(session)
     
     if not api_running:
         print("\n❌ Pokemon Card Scanner API is not running!")
@@ -202,18 +224,22 @@ async def main():
     
     print("\n✅ Both services are running. Starting tests...\n")
     
-    # Run test scenarios
-    await test_invalid_image()
-    await asyncio.sleep(1)  # Brief pause between tests
+    # Run test scenarios, moving on as soon as each one's webhooks arrive.
+    # Filtered or rate-limited errors never arrive, so the timeouts cap the wait.
+    count = await get_webhook_count(session)
+    await test_invalid_image(session)
+    await wait_for_webhooks(session, count + 1, timeout=1)
     
-    await test_processing_error()
-    await asyncio.sleep(1)
+    count = await get_webhook_count(session)
+    await test_processing_error(session)
+    await wait_for_webhooks(session, count + 1, timeout=1)
     
-    await trigger_multiple_errors()
-    await asyncio.sleep(2)  # Wait for webhooks to be processed
+    count = await get_webhook_count(session)
+    await trigger_multiple_errors(session)
+    await wait_for_webhooks(session, count + 3, timeout=2)
     
     # Check final stats
-    await check_webhook_stats()
+    await check_webhook_stats(session)
     
     print("\n✅ Tests completed!")
     print("Check the webhook server terminal for detailed webhook output.")
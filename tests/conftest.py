@@ -2,13 +2,13 @@
 
 import base64
 import io
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict, Any, List
 from unittest.mock import Mock
 
 import pytest
 from PIL import Image
-import responses
 
 # Test configuration
 TEST_CONFIG = {
@@ -35,7 +35,8 @@ def test_config():
     return TEST_CONFIG.copy()
 
 
-@pytest.fixture
+# Image fixtures return immutable bytes/str, so they are encoded once per test session
+@pytest.fixture(scope="session")
 def sample_card_image():
     """Create a sample card image for testing."""
     # Create a simple test image
@@ -46,13 +47,13 @@ def sample_card_image():
     return img_buffer.getvalue()
 
 
-@pytest.fixture 
+@pytest.fixture(scope="session")
 def sample_card_image_base64(sample_card_image):
     """Provide sample card image as base64 string."""
     return base64.b64encode(sample_card_image).decode('utf-8')
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_blurry_image():
     """Create a blurry test image."""
     img = Image.new('RGB', (200, 300), color=(128, 128, 128))
@@ -62,18 +63,15 @@ def sample_blurry_image():
     return img_buffer.getvalue()
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_high_quality_image():
     """Create a high quality test image."""
     img = Image.new('RGB', (800, 1200), color=(255, 255, 255))
-    # Add some detail/texture
+    # Add some detail/texture: 10x10 black squares on a checkered 50px grid
     for x in range(0, 800, 50):
         for y in range(0, 1200, 50):
             if (x + y) % 100 == 0:
-                for dx in range(10):
-                    for dy in range(10):
-                        if x + dx < 800 and y + dy < 1200:
-                            img.putpixel((x + dx, y + dy), (0, 0, 0))
+                img.paste((0, 0, 0), (x, y, x + 10, y + 10))
     
     img_buffer = io.BytesIO()
     img.save(img_buffer, format='JPEG', quality=95)
@@ -252,12 +250,12 @@ class TestImageFactory:
     """Factory for creating test images."""
     
     @staticmethod
+    @lru_cache(maxsize=64)
     def create_card_image(width=400, height=600, color=(0, 0, 255), quality=95):
-        """Create a test card image."""
+        """Create a test card image (cached: same arguments return the same immutable bytes)."""
         img = Image.new('RGB', (width, height), color=color)
         img_buffer = io.BytesIO()
         img.save(img_buffer, format='JPEG', quality=quality)
-        img_buffer.seek(0)
         return img_buffer.getvalue()
     
     @staticmethod
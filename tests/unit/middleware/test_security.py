@@ -204,6 +204,22 @@ class TestRateLimitMiddleware:
         # Only the current request should remain
         assert len(rate_limit_middleware.requests[client_ip]) == 1
 
+    @pytest.mark.asyncio
+    async def test_rate_limit_window_keeps_recent_requests(self, rate_limit_middleware, mock_request, mock_config):
+        """Test that only requests older than the window are dropped."""
+        client_ip = "192.168.1.1"
+        rate_limit_middleware.requests[client_ip].extend([1000.0, 1005.0, 1050.0])
+        
+        call_next = AsyncMock()
+        mock_response = Mock()
+        mock_response.headers = {}
+        call_next.return_value = mock_response
+        
+        with patch('time.time', return_value=1062.0):
+            await rate_limit_middleware.dispatch(mock_request, call_next)
+        
+        assert list(rate_limit_middleware.requests[client_ip]) == [1005.0, 1050.0, 1062.0]
+
     @pytest.mark.asyncio
     async def test_different_ips_separate_limits(self, rate_limit_middleware, mock_config):
         """Test that different IPs have separate rate limits."""
@@ -259,12 +275,12 @@ class TestSecurityHeadersMiddleware:
 
     @pytest.fixture
     def security_middleware(self):
-        """Create SecurityHeadersMiddleware instance."""
+        """Create SecurityHeadersMiddleware instance (request a config fixture first; config is read at init)."""
         app = Mock()
         return SecurityHeadersMiddleware(app)
 
     @pytest.mark.asyncio
-    async def test_security_headers_basic(self, security_middleware, mock_config_development):
+    async def test_security_headers_basic(self, mock_config_development, security_middleware):
         """Test basic security headers are added."""
         request = Mock(spec=Request)
         request.url = Mock()
@@ -298,7 +314,7 @@ class TestSecurityHeadersMiddleware:
         assert mock_response.headers["X-XSS-Protection"] == "1; mode=block"
 
     @pytest.mark.asyncio
-    async def test_csp_development(self, security_middleware, mock_config_development):
+    async def test_csp_development(self, mock_config_development, security_middleware):
         """Test CSP header in development environment."""
         request = Mock(spec=Request)
         request.url = Mock()
@@ -319,7 +335,7 @@ class TestSecurityHeadersMiddleware:
         assert "connect-src 'self' *" in csp
 
     @pytest.mark.asyncio
-    async def test_csp_production(self, security_middleware, mock_config_production):
+    async def test_csp_production(self, mock_config_production, security_middleware):
         """Test CSP header in production environment."""
         request = Mock(spec=Request)
         request.url = Mock()
@@ -341,7 +357,7 @@ class TestSecurityHeadersMiddleware:
         assert "connect-src 'self'" in csp  # Not wildcard
 
     @pytest.mark.asyncio
-    async def test_hsts_header_https_production(self, security_middleware, mock_config_production):
+    async def test_hsts_header_https_production(self, mock_config_production, security_middleware):
         """Test HSTS header is added for HTTPS in production."""
         request = Mock(spec=Request)
         request.url = Mock()
@@ -360,7 +376,7 @@ class TestSecurityHeadersMiddleware:
         assert "includeSubDomains" in hsts
 
     @pytest.mark.asyncio
-    async def test_no_hsts_header_http_production(self, security_middleware, mock_config_production):
+    async def test_no_hsts_header_http_production(self, mock_config_production, security_middleware):
         """Test HSTS header is not added for HTTP in production."""
         request = Mock(spec=Request)
         request.url = Mock()
@@ -376,7 +392,7 @@ class TestSecurityHeadersMiddleware:
         assert "Strict-Transport-Security" not in mock_response.headers
 
     @pytest.mark.asyncio
-    async def test_no_hsts_header_development(self, security_middleware, mock_config_development):
+    async def test_no_hsts_header_development(self, mock_config_development, security_middleware):
         """Test HSTS header is not added in development."""
         request = Mock(spec=Request)
         request.url = Mock()
@@ -392,7 +408,7 @@ class TestSecurityHeadersMiddleware:
         assert "Strict-Transport-Security" not in mock_response.headers
 
     @pytest.mark.asyncio
-    async def test_permissions_policy(self, security_middleware, mock_config_development):
+    async def test_permissions_policy(self, mock_config_development, security_middleware):
         """Test Permissions-Policy header."""
         request = Mock(spec=Request)
         request.url = Mock()
@@ -411,7 +427,7 @@ class TestSecurityHeadersMiddleware:
         assert "geolocation=()" in permissions_policy
 
     @pytest.mark.asyncio
-    async def test_referrer_policy(self, security_middleware, mock_config_development):
+    async def test_referrer_policy(self, mock_config_development, security_middleware):
         """Test Referrer-Policy header."""
         request = Mock(spec=Request)
         request.url = Mock()
@@ -518,6 +534,49 @@ class TestSecurityMiddlewareIntegration:
 class TestCleanupFunction:
     """Test cases for cleanup functions."""
 
+    @pytest.fixture
+    def middleware(self):
+        """Create RateLimitMiddleware instance."""
+        with patch('src.scanner.middleware.security.get_config') as mock_get_config:
+            mock_config = Mock()
+            mock_config.rate_limit_enabled = True
+            mock_config.rate_limit_per_minute = 5
+            mock_config.rate_limit_burst = 2
+            mock_get_config.return_value = mock_config
+            yield RateLimitMiddleware(Mock())
+
+    def test_sweep_removes_idle_clients(self, middleware):
+        """Test that clients with no requests in the window are forgotten."""
+        middleware.requests["10.0.0.1"].extend([1000.0, 1010.0])
+        middleware.requests["10.0.0.2"].extend([1000.0, 1050.0])
+        middleware.requests["10.0.0.3"]  # Emptied by window trimming
+        
+        middleware._sweep(1070.0)
+        
+        assert set(middleware.requests) == {"10.0.0.2"}
+        assert middleware._last_sweep == 1070.0
+
+    @pytest.mark.asyncio
+    async def test_dispatch_sweeps_once_per_window(self, middleware):
+        """Test that dispatch only sweeps after a full window has passed."""
+        middleware._last_sweep = 1000.0
+        middleware.requests["10.0.0.9"].append(990.0)
+        
+        request = Mock(spec=Request)
+        request.client = Mock()
+        request.client.host = "192.168.1.1"
+        request.headers = {}
+        call_next = AsyncMock(return_value=Mock(headers={}))
+        
+        with patch('time.time', return_value=1030.0):
+            await middleware.dispatch(request, call_next)
+        assert "10.0.0.9" in middleware.requests
+        
+        with patch('time.time', return_value=1060.0):
+            await middleware.dispatch(request, call_next)
+        assert "10.0.0.9" not in middleware.requests
+        assert "192.168.1.1" in middleware.requests
+
 
 
 class TestErrorHandling:
@@ -550,7 +609,7 @@ class TestErrorHandling:
                 current_time = 1000.0
                 
                 # Add requests to exceed limit (1 + 0 burst = 1 max, so 2nd request should fail)
-                middleware.requests["192.168.1.1"] = [current_time]
+                middleware.requests["192.168.1.1"].append(current_time)
                 
                 call_next = AsyncMock()
                 
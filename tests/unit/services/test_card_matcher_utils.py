@@ -253,6 +253,12 @@ class TestGetSetFamily:
         assert get_set_family("") is None
         assert get_set_family(None) is None
 
+    def test_returned_family_is_a_copy(self):
+        """Test that mutating a result doesn't affect later lookups."""
+        get_set_family("base").append("Not A Set")
+
+        assert get_set_family("base") == ["Base Set", "Base", "Base Set 2"]
+
 
 class TestIsXYFamilyMatch:
     """Test cases for is_xy_family_match function."""
@@ -1,10 +1,28 @@
 """Simple working tests for TCGClient service."""
 
+import asyncio
+import sqlite3
+from contextlib import closing
+
 import pytest
 from unittest.mock import Mock, patch, AsyncMock
+from src.scanner.config import Config
+from src.scanner.services import tcg_client as tcg_client_module
 from src.scanner.services.tcg_client import PokemonTcgClient
 
 
+class TransportError(Exception):
+    """Stand-in for httpx.HTTPError (httpx may be mocked by other test modules)."""
+
+
+@pytest.fixture(autouse=True)
+def isolated_shared_state():
+    """Give every test a fresh shared cache and rate-limit state."""
+    tcg_client_module._SHARED_STATES.clear()
+    yield
+    tcg_client_module._SHARED_STATES.clear()
+
+
 class TestPokemonTcgClientSimple:
     """Simple test cases for PokemonTcgClient that match actual interface."""
 
@@ -125,4 +143,509 @@ class TestPokemonTcgClientSimple:
         assert client.api_key == "test-key"
         assert client.rate_limit == 200
         assert client.cache_ttl > 0
-        assert len(client.base_url) > 0
\ No newline at end of file
+        assert len(client.base_url) > 0
+
+    @pytest.mark.asyncio
+    async def test_make_request_retries_transport_errors(self):
+        """Test that transport errors are retried before succeeding."""
+        client = PokemonTcgClient()
+
+        with patch.object(client, '_send_request', new_callable=AsyncMock) as mock_send, \
+             patch('src.scanner.services.tcg_client.httpx') as mock_httpx, \
+             patch('src.scanner.services.tcg_client.asyncio.sleep', new_callable=AsyncMock) as mock_sleep:
+            mock_httpx.HTTPError = TransportError
+            mock_send.side_effect = [TransportError("boom"), {"data": []}]
+
+            result = await client._make_request("GET", "/cards")
+
+            assert result == {"data": []}
+            assert mock_send.call_count == 2
+            mock_sleep.assert_awaited_once()
+            assert 2 <= mock_sleep.await_args.args[0] <= 2.3
+
+    @pytest.mark.asyncio
+    async def test_make_request_reraises_after_max_retries(self):
+        """Test that the last transport error is re-raised."""
+        client = PokemonTcgClient()
+
+        with patch.object(client, '_send_request', new_callable=AsyncMock) as mock_send, \
+             patch('src.scanner.services.tcg_client.httpx') as mock_httpx, \
+             patch('src.scanner.services.tcg_client.asyncio.sleep', new_callable=AsyncMock):
+            mock_httpx.HTTPError = TransportError
+            mock_send.side_effect = TransportError("boom")
+
+            with pytest.raises(TransportError):
+                await client._make_request("GET", "/cards")
+
+            assert mock_send.call_count == client.MAX_RETRIES
+
+    def test_normalization_helpers(self):
+        """Test that name, set and number normalization still map as expected."""
+        client = PokemonTcgClient()
+
+        assert client._map_set_name("hidden fates") == "Hidden Fates Shiny Vault"
+        assert client._map_set_name("Base Set") == "Base"
+        assert client._map_set_name("BREAKTHROUGH") == "BREAKthrough"
+        assert client._map_set_name("Unknown Set") == "Unknown Set"
+        assert client._map_set_name(None) is None
+        assert client._normalize_pokemon_name("Dracaufeu") == "Charizard"
+        assert client._normalize_pokemon_name("Espeon GX") == "Espeon-GX"
+        assert client._normalize_pokemon_name("Charizard EX") == "Charizard-EX"
+        assert client._normalize_pokemon_name("Pikachu VMAX") == "Pikachu VMAX"
+        assert client._normalize_pokemon_name("") == ""
+        assert client._normalize_pokemon_name("Farfetchd") == "Farfetch'd"
+        assert client._normalize_pokemon_name("Team Rockets Meowth") == "Team Rocket's Meowth"
+        assert client._normalize_pokemon_name("Charmander") == "Charmander"
+        assert client._normalize_card_number("060b") == "60b"
+        assert client._normalize_card_number("177a/168") == "177a"
+        assert client._normalize_card_number("SV1") == "SV1"
+        assert client._normalize_card_number("TG01/TG30") == "TG01"
+        assert client._normalize_card_number("000") == "0"
+        assert client._normalize_card_number("060") == "60"
+
+    def test_normalization_logs_on_every_call(self, caplog):
+        """Test that cached normalization still logs each mapping it applies."""
+        client = PokemonTcgClient()
+
+        with caplog.at_level("INFO", logger="src.scanner.services.tcg_client"):
+            for _ in range(2):
+                client._map_set_name("Base Set")
+                client._normalize_pokemon_name("Dracaufeu")
+                client._normalize_pokemon_name("Basic ⚡ Energy")
+                client._normalize_card_number("060b")
+
+        messages = [record.getMessage() for record in caplog.records]
+        assert messages.count("🗺️ Mapped set name: 'Base Set' → 'Base'") == 2
+        assert messages.count("🌍 Translated Pokemon name: 'Dracaufeu' → 'Charizard'") == 2
+        assert messages.count("⚡ Normalized energy symbols: 'Basic ⚡ Energy' → 'Basic Lightning Energy'") == 2
+        assert messages.count("🔢 Normalized card number: '060b' → '60b'") == 2
+
+    @pytest.mark.asyncio
+    async def test_search_cards_uses_cache_on_repeat(self):
+        """Test that identical searches are served from the cache."""
+        client = PokemonTcgClient()
+
+        with patch.object(client, '_make_request', new_callable=AsyncMock) as mock_request:
+            mock_request.return_value = {"data": [{"id": "base1-25"}], "totalCount": 1}
+
+            first = await client.search_cards(name="Pikachu", set_name="Base Set")
+            second = await client.search_cards(name="Pikachu", set_name="Base Set")
+
+            assert first == second
+            mock_request.assert_awaited_once()
+
+    def test_cache_key_ignores_param_order(self):
+        """Test that cache keys do not depend on parameter ordering."""
+        client = PokemonTcgClient()
+
+        key_a = client._get_cache_key("/cards", {"q": "name:x", "page": 1})
+        key_b = client._get_cache_key("/cards", {"page": 1, "q": "name:x"})
+
+        assert key_a == key_b
+        assert hash(key_a) == hash(key_b)
+
+    def test_cache_key_handles_list_values(self):
+        """Test that list-valued parameters still produce a hashable key."""
+        client = PokemonTcgClient()
+
+        key = client._get_cache_key("/cards", {"types": ["Fire", "Water"]})
+
+        assert key == ("/cards", (("types", ("Fire", "Water")),))
+        assert isinstance(hash(key), int)
+
+    def test_aiohttp_transport_used_when_available(self):
+        """Test that the aiohttp transport is only used when available and enabled."""
+        transport = Mock()
+        with patch('src.scanner.services.tcg_client.AIOHTTP_TRANSPORT_SUPPORTED', True), \
+             patch('src.scanner.services.tcg_client.AiohttpTransport', return_value=transport, create=True) as mock_transport, \
+             patch('src.scanner.services.tcg_client.httpx') as mock_httpx:
+            PokemonTcgClient()
+            assert mock_httpx.AsyncClient.call_args.kwargs["transport"] is transport
+            assert mock_transport.call_args.kwargs["client"] is tcg_client_module._create_aiohttp_session
+
+            PokemonTcgClient(use_aiohttp_transport=False)
+            assert "transport" not in mock_httpx.AsyncClient.call_args.kwargs
+
+    def test_http2_and_pool_limits_configured(self):
+        """Test that the HTTP client gets HTTP/2 (when available) and pool limits."""
+        with patch('src.scanner.services.tcg_client.HTTP2_SUPPORTED', True), \
+             patch('src.scanner.services.tcg_client.httpx') as mock_httpx:
+            PokemonTcgClient(use_aiohttp_transport=False)
+
+            kwargs = mock_httpx.AsyncClient.call_args.kwargs
+            assert kwargs["http2"] is True
+            mock_httpx.Limits.assert_called_once_with(
+                max_keepalive_connections=20,
+                max_connections=50,
+                keepalive_expiry=30.0,
+            )
+
+    @pytest.mark.asyncio
+    async def test_search_cards_passes_params_as_pairs(self):
+        """Test that search parameters are sent as a sequence of pairs."""
+        client = PokemonTcgClient()
+
+        with patch.object(client, '_make_request', new_callable=AsyncMock) as mock_request:
+            mock_request.return_value = {"data": [], "totalCount": 0}
+
+            await client.search_cards(
+                name="Pikachu", number="025", types=["Lightning", "Colorless"], order_by="number"
+            )
+
+            params = mock_request.call_args.kwargs["params"]
+            assert isinstance(params, tuple)
+            assert dict(params) == {
+                "page": 1,
+                "pageSize": 20,
+                "q": 'name:"Pikachu*" number:25 types:Lightning types:Colorless',
+                "orderBy": "number",
+            }
+
+    def test_cache_entries_expire(self):
+        """Test that expired cache entries are dropped on read."""
+        client = PokemonTcgClient(cache_ttl=60)
+        key = client._get_cache_key("/cards/base1-25")
+
+        with patch('src.scanner.services.tcg_client.time.monotonic', return_value=1000.0):
+            client._add_to_cache(key, {"data": {"id": "base1-25"}})
+            assert client._get_from_cache(key) == {"data": {"id": "base1-25"}}
+            stats = client.get_cache_stats()
+            assert stats["active_entries"] == 1
+
+        with patch('src.scanner.services.tcg_client.time.monotonic', return_value=1061.0):
+            assert client.get_cache_stats()["expired_entries"] == 1
+            assert client._get_from_cache(key) is None
+            assert key not in client.cache
+
+    @pytest.mark.asyncio
+    async def test_rate_limit_token_bucket(self):
+        """Test that requests consume tokens and the bucket refills over time."""
+        client = PokemonTcgClient(rate_limit=2)
+        client.client = Mock()
+        response = Mock(status_code=200, content=b'{"data": []}')
+        client.client.request = AsyncMock(return_value=response)
+
+        with patch('src.scanner.services.tcg_client.time.monotonic', return_value=client._state.last_refill):
+            await client._send_request("GET", "/cards")
+            await client._send_request("GET", "/cards")
+
+            assert client._is_rate_limited() is True
+            assert client.get_rate_limit_stats()["remaining_requests"] == 0
+
+        # Three quarters of an hour refills 1.5 of the 2 hourly tokens
+        with patch('src.scanner.services.tcg_client.time.monotonic', return_value=client._state.last_refill + 2700):
+            assert client._is_rate_limited() is False
+            assert client.get_rate_limit_stats()["remaining_requests"] == 1
+
+    def test_cache_evicts_least_recently_used(self):
+        """Test that the cache is bounded and evicts the least recently used entry."""
+        client = PokemonTcgClient(max_cache_entries=2)
+        key_a = client._get_cache_key("/cards/a")
+        key_b = client._get_cache_key("/cards/b")
+        key_c = client._get_cache_key("/cards/c")
+
+        client._add_to_cache(key_a, {"id": "a"})
+        client._add_to_cache(key_b, {"id": "b"})
+        client._get_from_cache(key_a)  # a becomes most recently used
+        client._add_to_cache(key_c, {"id": "c"})
+
+        assert list(client.cache) == [key_a, key_c]
+
+    def test_cache_sweeps_expired_entries_periodically(self):
+        """Test that expired entries are reclaimed without being read."""
+        client = PokemonTcgClient(cache_ttl=60)
+        client.CACHE_SWEEP_INTERVAL = 2
+        stale_key = client._get_cache_key("/cards/stale")
+
+        with patch('src.scanner.services.tcg_client.time.monotonic', return_value=1000.0):
+            client._add_to_cache(stale_key, {"id": "stale"})
+
+        with patch('src.scanner.services.tcg_client.time.monotonic', return_value=1100.0):
+            client._add_to_cache(client._get_cache_key("/cards/fresh"), {"id": "fresh"})
+
+        assert stale_key not in client.cache
+        assert len(client.cache) == 1
+
+    @pytest.mark.asyncio
+    async def test_concurrent_identical_searches_are_coalesced(self):
+        """Test that concurrent identical searches share a single API request."""
+        client = PokemonTcgClient()
+        release = asyncio.Event()
+
+        async def slow_request(*args, **kwargs):
+            await release.wait()
+            return {"data": [{"id": "base1-4"}], "totalCount": 1}
+
+        with patch.object(client, '_make_request', new_callable=AsyncMock) as mock_request:
+            mock_request.side_effect = slow_request
+
+            tasks = [
+                asyncio.create_task(client.search_cards(name="Charizard"))
+                for _ in range(3)
+            ]
+            await asyncio.sleep(0)
+            release.set()
+            results = await asyncio.gather(*tasks)
+
+            assert mock_request.await_count == 1
+            assert all(result == results[0] for result in results)
+            assert client._inflight == {}
+
+    @pytest.mark.asyncio
+    async def test_coalesced_request_failure_propagates(self):
+        """Test that a failed in-flight request raises for every waiter."""
+        client = PokemonTcgClient()
+        release = asyncio.Event()
+
+        async def failing_request(*args, **kwargs):
+            await release.wait()
+            raise RuntimeError("upstream down")
+
+        with patch.object(client, '_make_request', new_callable=AsyncMock) as mock_request:
+            mock_request.side_effect = failing_request
+
+            tasks = [
+                asyncio.create_task(client.get_card_by_id("base1-4"))
+                for _ in range(2)
+            ]
+            await asyncio.sleep(0)
+            release.set()
+            results = await asyncio.gather(*tasks, return_exceptions=True)
+
+            assert mock_request.await_count == 1
+            assert all(isinstance(result, RuntimeError) for result in results)
+            assert client._inflight == {}
+
+    @pytest.mark.asyncio
+    async def test_cancelled_owner_does_not_cancel_waiters(self):
+        """Test that cancelling the caller that started a request spares other waiters."""
+        client = PokemonTcgClient()
+        release = asyncio.Event()
+
+        async def slow_request(*args, **kwargs):
+            await release.wait()
+            return {"data": {"id": "base1-4"}}
+
+        with patch.object(client, '_make_request', new_callable=AsyncMock) as mock_request:
+            mock_request.side_effect = slow_request
+
+            owner = asyncio.create_task(client.get_card_by_id("base1-4"))
+            await asyncio.sleep(0)
+            waiter = asyncio.create_task(client.get_card_by_id("base1-4"))
+            await asyncio.sleep(0)
+
+            owner.cancel()
+            await asyncio.sleep(0)
+            release.set()
+
+            assert await waiter == {"data": {"id": "base1-4"}}
+            assert owner.cancelled()
+            assert mock_request.await_count == 1
+            assert client._inflight == {}
+
+    def test_clients_share_cache_and_rate_limit_state(self):
+        """Test that clients for the same account share cache and limiter state."""
+        first = PokemonTcgClient(api_key="shared-key")
+        second = PokemonTcgClient(api_key="shared-key")
+        other = PokemonTcgClient(api_key="other-key")
+
+        key = first._get_cache_key("/cards/base1-25")
+        first._add_to_cache(key, {"id": "base1-25"})
+        first._state.tokens -= 1
+
+        assert second._get_from_cache(key) == {"id": "base1-25"}
+        assert second._state is first._state
+        assert other._get_from_cache(key) is None
+        assert other._state is not first._state
+
+    @pytest.mark.asyncio
+    async def test_clients_share_http_client_until_shutdown(self):
+        """Test that per-scan clients reuse one HTTP client that shutdown closes."""
+        with patch('src.scanner.services.tcg_client.httpx') as mock_httpx:
+            mock_httpx.AsyncClient.return_value = Mock(is_closed=False, aclose=AsyncMock())
+            first = PokemonTcgClient(api_key="shared-key", use_aiohttp_transport=False)
+            async with PokemonTcgClient(api_key="shared-key", use_aiohttp_transport=False) as second:
+                assert second.client is first.client
+            first.client.aclose.assert_not_awaited()
+            assert mock_httpx.AsyncClient.call_count == 1
+
+            await tcg_client_module.close_tcg_clients()
+
+            first.client.aclose.assert_awaited_once()
+            assert first._state.http_clients == {}
+
+    @pytest.mark.asyncio
+    async def test_configured_rate_limit_covers_many_scans(self):
+        """Test that the configured hourly budget isn't exhausted by a burst of scans."""
+        rate_limit = Config().tcg_rate_limit_per_hour
+        response = Mock(status_code=200, content=b'{"data": [], "totalCount": 0}')
+
+        # The scan route builds a fresh client per scan, all sharing one bucket
+        for scan in range(40):
+            client = PokemonTcgClient(api_key="scan-key", rate_limit=rate_limit)
+            client.client = Mock()
+            client.client.request = AsyncMock(return_value=response)
+            for page in range(1, 9):
+                await client.search_cards(name=f"Card {scan}", page=page)
+
+        assert client.get_rate_limit_stats()["remaining_requests"] > 0
+
+    @pytest.mark.asyncio
+    async def test_disk_cache_survives_restart(self, tmp_path):
+        """Test that responses persisted to disk are reused by a fresh process."""
+        client = PokemonTcgClient(cache_dir=tmp_path)
+
+        with patch.object(client, '_make_request', new_callable=AsyncMock) as mock_request:
+            mock_request.return_value = {"data": {"id": "base1-25"}}
+            await client.get_card_by_id("base1-25")
+            await client._disk.flush()
+
+        # Simulate a restart: in-memory state is gone, the SQLite file remains
+        tcg_client_module._SHARED_STATES.clear()
+        restarted = PokemonTcgClient(cache_dir=tmp_path)
+
+        with patch.object(restarted, '_make_request', new_callable=AsyncMock) as mock_request:
+            result = await restarted.get_card_by_id("base1-25")
+
+            assert result == {"data": {"id": "base1-25"}}
+            mock_request.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_disk_cache_errors_fall_back_to_api(self, tmp_path):
+        """Test that SQLite errors are a cache miss on read and a dropped write on flush."""
+        client = PokemonTcgClient(cache_dir=tmp_path)
+        locked = sqlite3.OperationalError("database is locked")
+
+        with patch.object(client._disk, '_connect', side_effect=locked), \
+             patch.object(client, '_make_request', new_callable=AsyncMock) as mock_request:
+            mock_request.return_value = {"data": {"id": "base1-25"}}
+
+            assert await client.get_card_by_id("base1-25") == {"data": {"id": "base1-25"}}
+            await client._disk.flush()
+
+            mock_request.assert_awaited_once()
+            assert client._disk._pending == {}
+
+    def test_disk_cache_uses_wal_and_busy_timeout(self, tmp_path):
+        """Test that the shared SQLite file tolerates concurrent workers."""
+        disk = PokemonTcgClient(cache_dir=tmp_path)._disk
+
+        with closing(disk._connect()) as conn:
+            assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+            assert conn.execute("PRAGMA busy_timeout").fetchone()[0] == disk.BUSY_TIMEOUT * 1000
+
+    @pytest.mark.asyncio
+    async def test_api_error_uses_raw_body_snippet(self):
+        """Test that 4xx errors report a truncated body without JSON parsing."""
+        client = PokemonTcgClient()
+        error_response = Mock(status_code=400, content=b"x", text="bad query " * 100)
+        error_response.json.side_effect = AssertionError("body should not be parsed")
+        error = TransportError("400")
+        error.response = error_response
+
+        client.client = Mock()
+        client.client.request = AsyncMock(return_value=Mock())
+        client.client.request.return_value.raise_for_status.side_effect = error
+
+        with patch('src.scanner.services.tcg_client.httpx') as mock_httpx:
+            mock_httpx.HTTPStatusError = TransportError
+            with pytest.raises(tcg_client_module.PokemonTcgApiError) as exc_info:
+                await client._send_request("GET", "/cards")
+
+        message = str(exc_info.value)
+        assert message.startswith("API error 400: bad query")
+        assert len(message) == len("API error 400: ") + 512
+
+    @pytest.mark.asyncio
+    async def test_get_card_by_id_projects_fields(self):
+        """Test that a field projection is returned and cached separately."""
+        client = PokemonTcgClient()
+        full_card = {"data": {"id": "base1-4", "name": "Charizard", "attacks": [{}] * 3}}
+
+        with patch.object(client, '_make_request', new_callable=AsyncMock) as mock_request:
+            mock_request.return_value = full_card
+
+            projected = await client.get_card_by_id("base1-4", fields=["id", "name"])
+            again = await client.get_card_by_id("base1-4", fields=("id", "name"))
+            full = await client.get_card_by_id("base1-4")
+
+            assert projected == {"data": {"id": "base1-4", "name": "Charizard"}}
+            assert again == projected
+            assert full == full_card
+            assert mock_request.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_get_cards_by_ids_batches_cache_misses(self):
+        """Test that uncached IDs are fetched with a single OR-query search."""
+        client = PokemonTcgClient()
+        client._add_to_cache(client._card_cache_key("base1-4"), {"data": {"id": "base1-4"}})
+
+        with patch.object(client, '_make_request', new_callable=AsyncMock) as mock_request:
+            mock_request.return_value = {"data": [{"id": "base1-25"}, {"id": "xy1-1"}]}
+
+            results = await client.get_cards_by_ids(["base1-4", "base1-25", "xy1-1", "missing-1"])
+
+            mock_request.assert_awaited_once()
+            params = dict(mock_request.call_args.kwargs["params"])
+            assert params["q"] == "id:base1-25 OR id:xy1-1 OR id:missing-1"
+            assert set(results) == {"base1-4", "base1-25", "xy1-1"}
+
+            # Batched cards are cached for individual lookups
+            assert await client.get_card_by_id("xy1-1") == {"data": {"id": "xy1-1"}}
+            mock_request.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_get_cards_by_ids_uses_disk_cache(self, tmp_path):
+        """Test that batch lookups read from and write back to the disk cache."""
+        client = PokemonTcgClient(cache_dir=tmp_path)
+        client._disk.set(repr(client._card_cache_key("base1-4")), {"data": {"id": "base1-4"}}, 3600)
+        await client._disk.flush()
+
+        with patch.object(client, '_make_request', new_callable=AsyncMock) as mock_request:
+            mock_request.return_value = {"data": [{"id": "base1-25"}]}
+
+            results = await client.get_cards_by_ids(["base1-4", "base1-25"])
+            await client._disk.flush()
+
+            params = dict(mock_request.call_args.kwargs["params"])
+            assert params["q"] == "id:base1-25"
+            assert results["base1-4"] == {"data": {"id": "base1-4"}}
+
+        # A fresh process finds the batch-fetched card on disk
+        tcg_client_module._SHARED_STATES.clear()
+        restarted = PokemonTcgClient(cache_dir=tmp_path)
+        with patch.object(restarted, '_make_request', new_callable=AsyncMock) as mock_request:
+            assert await restarted.get_card_by_id("base1-25") == {"data": {"id": "base1-25"}}
+            mock_request.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_get_cards_by_ids_coalesces_with_single_lookups(self):
+        """Test that single-card lookups join an in-flight batch and vice versa."""
+        client = PokemonTcgClient()
+        release = asyncio.Event()
+
+        async def slow_request(method, endpoint, **kwargs):
+            await release.wait()
+            if "params" in kwargs:
+                return {"data": [{"id": "base1-25"}]}
+            return {"data": {"id": "xy1-1"}}
+
+        with patch.object(client, '_make_request', new_callable=AsyncMock) as mock_request:
+            mock_request.side_effect = slow_request
+
+            single = asyncio.create_task(client.get_card_by_id("xy1-1"))
+            await asyncio.sleep(0)
+            batch = asyncio.create_task(client.get_cards_by_ids(["base1-25", "xy1-1", "missing-1"]))
+            await asyncio.sleep(0)
+            joined = asyncio.create_task(client.get_card_by_id("base1-25"))
+            missing = asyncio.create_task(client.get_card_by_id("missing-1"))
+            await asyncio.sleep(0)
+            release.set()
+
+            results = await batch
+            assert set(results) == {"base1-25", "xy1-1"}
+            assert await joined == {"data": {"id": "base1-25"}}
+            assert await single == {"data": {"id": "xy1-1"}}
+            assert await missing == {"data": [], "totalCount": 0}
+            assert mock_request.await_count == 2
+            assert client._inflight == {}
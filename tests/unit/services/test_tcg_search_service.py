@@ -1,5 +1,7 @@
 """Unit tests for TCGSearchService."""
 
+import asyncio
+
 import pytest
 from unittest.mock import Mock, AsyncMock, patch
 from typing import Dict, Any, List
@@ -102,14 +104,14 @@ class TestTCGSearchService:
             "number": "58"
         }
         
-        # Mock all potential strategy calls
-        mock_tcg_client.search_cards.side_effect = [
-            {"data": []},  # Strategy 1 fails
-            {"data": [sample_card_data]},  # Strategy 1.25 succeeds
-            {"data": []},  # Strategy 2 (set+name)
-            {"data": []},  # Strategy 3 (name+hp) - skipped if no HP
-            {"data": []},  # Strategy 5 (fuzzy)
-        ]
+        # Strategy 2 runs concurrently with strategy 1, so route by query instead of call order
+        async def mock_search(**kwargs):
+            # Strategy 1.25 searches by number without a set
+            if kwargs.get("number") == "58" and "set_name" not in kwargs:
+                return {"data": [sample_card_data]}
+            return {"data": []}
+
+        mock_tcg_client.search_cards = AsyncMock(side_effect=mock_search)
         
         results, attempts, matches = await service.search_for_card(parsed_data, mock_tcg_client)
         
@@ -120,10 +122,12 @@ class TestTCGSearchService:
         assert any(att["strategy"] == "cross_set_number_name" for att in attempts)
         
         # Verify the cross-set search didn't include set_name
-        second_call = mock_tcg_client.search_cards.call_args_list[1]
-        assert second_call.kwargs["name"] == "Pikachu"
-        assert second_call.kwargs["number"] == "58"
-        assert "set_name" not in second_call.kwargs
+        cross_set_calls = [
+            call for call in mock_tcg_client.search_cards.call_args_list
+            if "set_name" not in call.kwargs and call.kwargs.get("number")
+        ]
+        assert len(cross_set_calls) == 1
+        assert cross_set_calls[0].kwargs["name"] == "Pikachu"
 
     @pytest.mark.asyncio
     async def test_strategy_1_5_set_family(self, service, mock_tcg_client, sample_card_data):
@@ -141,17 +145,13 @@ class TestTCGSearchService:
             "number": "42"
         }
         
-        # Mock responses for different strategies
-        mock_tcg_client.search_cards.side_effect = [
-            {"data": []},  # Strategy 1 fails
-            {"data": []},  # Strategy 1.25 fails  
-            {"data": [xy_card]},  # Strategy 1.5 succeeds for first family set
-            {"data": []},  # Strategy 1.5 second family set
-            {"data": []},  # Strategy 1.5 third family set
-            {"data": []},  # Strategy 2 (set+name)
-            {"data": []},  # Strategy 3 (name+hp) - if no HP in data
-            {"data": []},  # Strategy 5 (fuzzy)
-        ]
+        # Only the first family set (Strategy 1.5) has the card
+        async def mock_search(**kwargs):
+            if kwargs.get("set_name") == "XY Base" and kwargs.get("number") == "42":
+                return {"data": [xy_card]}
+            return {"data": []}
+
+        mock_tcg_client.search_cards = AsyncMock(side_effect=mock_search)
         
         with patch('src.scanner.services.tcg_search_service.get_set_family') as mock_get_family:
             mock_get_family.return_value = ["XY Base", "XY BREAKpoint", "XY BREAKthrough"]
@@ -164,6 +164,62 @@ class TestTCGSearchService:
         # Check that set family strategy was used
         assert any(att["strategy"] == "set_family_number_name" for att in attempts)
 
+    @pytest.mark.asyncio
+    async def test_strategy_1_5_family_sets_searched_concurrently(self, service, mock_tcg_client):
+        """Test that family set searches are in flight together and merged in family order."""
+        parsed_data = {"name": "Pikachu", "set_name": "XY", "number": "42"}
+        family = ["XY Base", "XY BREAKpoint", "XY BREAKthrough"]
+        in_flight = 0
+        max_in_flight = 0
+
+        async def mock_search(**kwargs):
+            nonlocal in_flight, max_in_flight
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            await asyncio.sleep(0)
+            in_flight -= 1
+            if kwargs.get("set_name") in family[1:]:
+                set_name = kwargs["set_name"]
+                return {"data": [{"id": set_name, "name": "Pikachu", "set": {"name": set_name}, "number": "42"}]}
+            return {"data": []}
+
+        mock_tcg_client.search_cards = AsyncMock(side_effect=mock_search)
+
+        with patch('src.scanner.services.tcg_search_service.get_set_family', return_value=family):
+            results, attempts, matches = await service.search_for_card(parsed_data, mock_tcg_client)
+
+        # Strategy 2 overlaps too, so at least the three family searches are concurrent
+        assert max_in_flight >= 3
+        assert [card["id"] for card in results] == ["XY BREAKpoint", "XY BREAKthrough"]
+        family_attempt = next(att for att in attempts if att["strategy"] == "set_family_number_name")
+        assert family_attempt["results"] == 2
+
+    @pytest.mark.asyncio
+    async def test_strategy_1_5_records_deduplicated_count(self, service, mock_tcg_client):
+        """Test that the family attempt counts new results, not raw response cards."""
+        parsed_data = {"name": "Pikachu", "set_name": "XY", "number": "42"}
+        family = ["XY Base", "XY BREAKpoint", "XY BREAKthrough"]
+        shared_card = {"id": "xy1-42", "name": "Pikachu", "set": {"name": "XY Base"}, "number": "42"}
+        other_card = {"id": "xy8-42", "name": "Pikachu", "set": {"name": "XY BREAKthrough"}, "number": "42"}
+
+        # Every family set returns the already-seen card; only one adds another
+        async def mock_search(**kwargs):
+            if kwargs.get("set_name") in family:
+                data = [shared_card]
+                if kwargs["set_name"] == "XY BREAKthrough":
+                    data.append(other_card)
+                return {"data": data}
+            return {"data": []}
+
+        mock_tcg_client.search_cards = AsyncMock(side_effect=mock_search)
+
+        with patch('src.scanner.services.tcg_search_service.get_set_family', return_value=family):
+            results, attempts, matches = await service.search_for_card(parsed_data, mock_tcg_client)
+
+        assert [card["id"] for card in results] == ["xy1-42", "xy8-42"]
+        family_attempt = next(att for att in attempts if att["strategy"] == "set_family_number_name")
+        assert family_attempt["results"] == 2
+
     @pytest.mark.asyncio
     async def test_strategy_2_set_name_only(self, service, mock_tcg_client, sample_card_data):
         """Test Strategy 2: set + name without number."""
@@ -180,6 +236,32 @@ class TestTCGSearchService:
         assert len(results) == 1
         assert any(att["strategy"] == "set_name_only" for att in attempts)
 
+    @pytest.mark.asyncio
+    async def test_set_name_search_overlaps_number_strategies(self, service, mock_tcg_client, sample_card_data):
+        """Test that Strategy 2 is in flight alongside Strategy 1 but merged after it."""
+        set_name_card = {"id": "base1-27", "name": "Pikachu", "set": {"name": "Base Set"}, "number": "27"}
+        in_flight = 0
+        max_in_flight = 0
+
+        async def mock_search(**kwargs):
+            nonlocal in_flight, max_in_flight
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            await asyncio.sleep(0)
+            in_flight -= 1
+            if "number" in kwargs:
+                return {"data": [sample_card_data]}
+            return {"data": [set_name_card, sample_card_data]}
+
+        mock_tcg_client.search_cards = AsyncMock(side_effect=mock_search)
+        parsed_data = {"name": "Pikachu", "set_name": "Base Set", "number": "58"}
+
+        results, attempts, matches = await service.search_for_card(parsed_data, mock_tcg_client)
+
+        assert max_in_flight == 2
+        assert [card["id"] for card in results] == ["base1-58", "base1-27"]
+        assert [att["strategy"] for att in attempts[:2]] == ["set_number_name_exact", "set_name_only"]
+
     @pytest.mark.asyncio
     async def test_strategy_3_name_hp(self, service, mock_tcg_client, sample_card_data):
         """Test Strategy 3: name + HP cross-set search."""
@@ -281,6 +363,71 @@ class TestTCGSearchService:
             assert card["id"] not in seen_ids
             seen_ids.add(card["id"])
 
+    @pytest.mark.asyncio
+    async def test_seen_ids_reset_between_searches(self, service, mock_tcg_client, sample_parsed_data, sample_card_data):
+        """Test that the de-duplication index doesn't leak into the next search."""
+        mock_tcg_client.search_cards.return_value = {"data": [sample_card_data]}
+
+        await service.search_for_card(sample_parsed_data, mock_tcg_client)
+        results, attempts, matches = await service.search_for_card(sample_parsed_data, mock_tcg_client)
+
+        assert [card["id"] for card in results] == ["base1-58"]
+        assert service._seen_ids == {"base1-58"}
+
+    @pytest.mark.asyncio
+    async def test_matches_carry_market_prices_and_tolerate_missing_set(self, service, mock_tcg_client):
+        """Test PokemonCard conversion of tcgplayer prices and cards without set data."""
+        priced = {
+            "id": "base1-58",
+            "name": "Pikachu",
+            "set": {"name": "Base Set"},
+            "tcgplayer": {"prices": {"normal": {"market": 1.5}}},
+        }
+        no_set = {"id": "promo-1", "name": "Pikachu", "set": None, "tcgplayer": {}}
+        mock_tcg_client.search_cards.return_value = {"data": [priced, no_set]}
+
+        results, attempts, matches = await service.search_for_card({"name": "Pikachu"}, mock_tcg_client)
+
+        assert matches[0].set_name == "Base Set"
+        assert matches[0].market_prices == {"normal": {"market": 1.5}}
+        assert matches[1].set_name is None
+        assert matches[1].market_prices is None
+
+    @pytest.mark.asyncio
+    async def test_strategy_error_cancels_prefetched_searches(self, service, mock_tcg_client, sample_parsed_data):
+        """Test that a failing strategy propagates without leaving prefetches running."""
+        set_name_started = asyncio.Event()
+        set_name_cancelled = False
+
+        async def mock_search(**kwargs):
+            nonlocal set_name_cancelled
+            if "number" in kwargs:
+                await set_name_started.wait()
+                raise RuntimeError("API down")
+            set_name_started.set()
+            try:
+                await asyncio.Event().wait()
+            except asyncio.CancelledError:
+                set_name_cancelled = True
+                raise
+
+        mock_tcg_client.search_cards = AsyncMock(side_effect=mock_search)
+
+        with pytest.raises(RuntimeError, match="API down"):
+            await service.search_for_card(sample_parsed_data, mock_tcg_client)
+
+        assert set_name_cancelled
+
+    @pytest.mark.asyncio
+    async def test_duplicates_within_one_response_are_dropped(self, service, mock_tcg_client, sample_card_data):
+        """Test that a response repeating the same card only adds it once."""
+        mock_tcg_client.search_cards.return_value = {"data": [sample_card_data] * 20}
+
+        results, attempts, matches = await service.search_for_card({"name": "Pikachu"}, mock_tcg_client)
+
+        assert [card["id"] for card in results] == ["base1-58"]
+        assert attempts[-1]["results"] == 20
+
     def test_is_valid_set_name(self, service):
         """Test set name validation."""
         # Valid set names
@@ -293,6 +440,7 @@ class TestTCGSearchService:
         assert not service._is_valid_set_name("possibly Base Set")
         assert not service._is_valid_set_name("Base Set, but unclear")
         assert not service._is_valid_set_name("X" * 51)  # Too long
+        assert not service._is_valid_set_name("Possibly Jungle")  # Invalid phrase, any case
         assert not service._is_valid_set_name(None)
         assert not service._is_valid_set_name("")
 
@@ -310,6 +458,8 @@ class TestTCGSearchService:
         assert not service._is_valid_card_number("25 of 102")
         assert not service._is_valid_card_number("1/102")  # Slashes not allowed
         assert not service._is_valid_card_number("ABC")  # No digits
+        assert not service._is_valid_card_number("Unknown1")  # Invalid phrase, any case
+        assert not service._is_valid_card_number("58\n-")
         assert not service._is_valid_card_number(None)
         assert not service._is_valid_card_number("")
 
@@ -1,5 +1,7 @@
 """Comprehensive tests for webhook_service.py - consolidated from simple and extended tests."""
 
+import asyncio
+import orjson
 import pytest
 import time
 from unittest.mock import Mock, patch, AsyncMock
@@ -22,7 +24,7 @@ class TestRateLimiter:
         
         assert limiter.max_requests == 5
         assert limiter.window == 60
-        assert limiter.requests == []
+        assert len(limiter.requests) == 0
 
     def test_rate_limiter_allow_request_empty(self):
         """Test allowing request when no previous requests."""
@@ -59,7 +61,7 @@ class TestRateLimiter:
         limiter = RateLimiter(max_requests=2, window=1)  # 1 second window
         
         # Add old request manually
-        old_time = time.time() - 2  # 2 seconds ago
+        old_time = time.monotonic() - 2  # 2 seconds ago
         limiter.requests.append(old_time)
         
         # Allow request should clean up old requests
@@ -71,8 +73,8 @@ class TestRateLimiter:
         limiter = RateLimiter(max_requests=3, window=1)
         
         # Add multiple old requests
-        old_time1 = time.time() - 2
-        old_time2 = time.time() - 1.5
+        old_time1 = time.monotonic() - 2
+        old_time2 = time.monotonic() - 1.5
         limiter.requests.extend([old_time1, old_time2])
         
         # Allow request should clean up all old requests
@@ -84,8 +86,8 @@ class TestRateLimiter:
         limiter = RateLimiter(max_requests=3, window=2)
         
         # Add one old request and one recent request
-        old_time = time.time() - 3  # Outside window
-        recent_time = time.time() - 1  # Inside window
+        old_time = time.monotonic() - 3  # Outside window
+        recent_time = time.monotonic() - 1  # Inside window
         limiter.requests.extend([old_time, recent_time])
         
         # Should clean up old, keep recent, and allow new
@@ -97,7 +99,7 @@ class TestRateLimiter:
         limiter = RateLimiter(max_requests=2, window=1)
         
         # Add request at boundary
-        boundary_time = time.time() - 1.0001  # Just outside window
+        boundary_time = time.monotonic() - 1.0001  # Just outside window
         limiter.requests.append(boundary_time)
         
         # Should clean up boundary request
@@ -113,6 +115,20 @@ class TestRateLimiter:
         assert limiter.allow_request() is True
         assert limiter.allow_request() is True
 
+    @pytest.mark.asyncio
+    async def test_rate_limiter_concurrent_burst(self):
+        """Test that a burst of concurrent callers can't over-admit."""
+        limiter = RateLimiter(max_requests=3, window=60)
+
+        async def caller():
+            await asyncio.sleep(0)
+            return limiter.allow_request()
+
+        results = await asyncio.gather(*(caller() for _ in range(20)))
+
+        assert results.count(True) == 3
+        assert len(limiter.requests) == 3
+
     def test_rate_limiter_zero_max_requests(self):
         """Test RateLimiter with zero max requests."""
         limiter = RateLimiter(max_requests=0, window=60)
@@ -247,6 +263,20 @@ class TestWebhookServiceInitialization:
         client = webhook_service.client
         assert client is not None
 
+    def test_client_keeps_connections_alive(self):
+        """Test that the HTTP client is configured for connection reuse."""
+        with patch('src.scanner.services.webhook_service.httpx') as mock_httpx:
+            WebhookService()
+
+        client_kwargs = mock_httpx.AsyncClient.call_args.kwargs
+        assert client_kwargs["headers"] == {"Content-Type": "application/json"}
+        assert "http2" in client_kwargs
+        mock_httpx.Limits.assert_called_once_with(
+            max_keepalive_connections=10,
+            max_connections=20,
+            keepalive_expiry=60.0,
+        )
+
     def test_webhook_service_string_representation(self, webhook_service):
         """Test webhook service string representation."""
         str_repr = str(webhook_service)
@@ -279,6 +309,7 @@ class TestSendErrorNotification:
         config.error_webhook_min_level = "ERROR"
         config.error_webhook_environment_tag = "test"
         config.error_webhook_include_traceback = False
+        config.error_webhook_batch_size = 1
         
         with patch('src.scanner.services.webhook_service.get_config', return_value=config):
             with patch('src.scanner.services.webhook_service.config', config):
@@ -286,7 +317,7 @@ class TestSendErrorNotification:
                     mock_client.return_value = AsyncMock()
                     service = WebhookService()
                     service.client = mock_client.return_value
-                    return service
+                    yield service
 
     @pytest.mark.asyncio
     async def test_send_error_notification_method_exists(self, webhook_service):
@@ -337,11 +368,11 @@ class TestSendErrorNotification:
     @pytest.mark.asyncio
     async def test_send_error_notification_disabled(self, webhook_service):
         """Test send_error_notification when webhooks are disabled."""
-        with patch('src.scanner.services.webhook_service.get_config') as mock_config:
-            mock_config.return_value = Mock(
-                error_webhook_enabled=False,
-                error_webhook_url="https://example.com/webhook"
-            )
+        disabled_config = Mock(
+            error_webhook_enabled=False,
+            error_webhook_url="https://example.com/webhook"
+        )
+        with patch('src.scanner.services.webhook_service.config', disabled_config):
             
             result = await webhook_service.send_error_notification(
                 "Test error message"
@@ -353,11 +384,17 @@ class TestSendErrorNotification:
     @pytest.mark.asyncio
     async def test_send_error_notification_no_url(self, webhook_service):
         """Test send_error_notification when no URL is configured."""
-        with patch('src.scanner.services.webhook_service.get_config') as mock_config:
-            mock_config.return_value = Mock(
-                error_webhook_enabled=True,
-                error_webhook_url=None
-            )
+        no_url_config = Mock(
+            error_webhook_enabled=True,
+            error_webhook_url=None,
+            error_webhook_timeout=10,
+            error_webhook_rate_limit=5,
+            error_webhook_min_level="ERROR",
+            error_webhook_batch_size=1,
+        )
+        with patch('src.scanner.services.webhook_service.config', no_url_config):
+            # The URL is validated when the service is constructed
+            webhook_service = WebhookService()
             
             result = await webhook_service.send_error_notification(
                 "Test error message"
@@ -435,10 +472,11 @@ class TestSendErrorNotification:
             error_message="",
             level="ERROR"
         )
+        await webhook_service_minimal.flush()
 
         assert result is True
         call_args = webhook_service_minimal.client.post.call_args
-        payload = call_args[1]['json']
+        payload = orjson.loads(call_args[1]['content'])
         assert payload['message'] == ""
 
     @pytest.mark.asyncio
@@ -457,10 +495,11 @@ class TestSendErrorNotification:
             traceback=None,
             context=None
         )
+        await webhook_service_minimal.flush()
 
         assert result is True
         call_args = webhook_service_minimal.client.post.call_args
-        payload = call_args[1]['json']
+        payload = orjson.loads(call_args[1]['content'])
         
         # None values should not be included in payload
         assert 'request_id' not in payload
@@ -469,6 +508,137 @@ class TestSendErrorNotification:
         assert 'context' not in payload
         assert 'traceback' not in payload
 
+    @pytest.mark.asyncio
+    async def test_send_returns_before_delivery(self, webhook_service_minimal):
+        """Test that callers don't wait on the webhook POST."""
+        release = asyncio.Event()
+
+        async def slow_post(*args, **kwargs):
+            await release.wait()
+            return Mock(status_code=200)
+
+        webhook_service_minimal.client.post = AsyncMock(side_effect=slow_post)
+
+        # The POST can't finish until released, so this would time out if send waited on it
+        result = await asyncio.wait_for(
+            webhook_service_minimal.send_error_notification("Test error"), timeout=1
+        )
+
+        assert result is True
+        release.set()
+        await webhook_service_minimal.flush()
+        webhook_service_minimal.client.post.assert_awaited_once()
+        await webhook_service_minimal.close()
+
+    @pytest.mark.asyncio
+    async def test_full_queue_drops_notification(self, webhook_service_minimal):
+        """Test that a full queue rejects new notifications instead of blocking."""
+        webhook_service_minimal._rate_limiter = RateLimiter(max_requests=10, window=60)
+        webhook_service_minimal._queue = asyncio.Queue(maxsize=1)
+        webhook_service_minimal._ensure_worker = Mock()  # keep the queue undrained
+
+        assert await webhook_service_minimal.send_error_notification("first") is True
+        assert await webhook_service_minimal.send_error_notification("second") is False
+
+    @pytest.mark.asyncio
+    async def test_close_delivers_pending_notifications(self, webhook_service_minimal):
+        """Test that close() flushes the queue before shutting the client."""
+        webhook_service_minimal.client.post = AsyncMock(return_value=Mock(status_code=200))
+
+        await webhook_service_minimal.send_error_notification("Test error")
+        await webhook_service_minimal.close()
+
+        webhook_service_minimal.client.post.assert_awaited_once()
+        webhook_service_minimal.client.aclose.assert_awaited_once()
+        assert webhook_service_minimal._worker is None
+
+    @pytest.mark.asyncio
+    async def test_backed_up_notifications_are_batched(self, webhook_service_minimal):
+        """Test that queued notifications are posted together when batching is enabled."""
+        webhook_service_minimal._batch_size = 20
+        webhook_service_minimal._rate_limiter = RateLimiter(max_requests=10, window=60)
+        webhook_service_minimal.client.post = AsyncMock(return_value=Mock(status_code=200))
+
+        for i in range(3):
+            await webhook_service_minimal.send_error_notification(f"error {i}")
+        await webhook_service_minimal.flush()
+
+        webhook_service_minimal.client.post.assert_awaited_once()
+        body = orjson.loads(webhook_service_minimal.client.post.call_args.kwargs["content"])
+        assert [event["message"] for event in body["events"]] == ["error 0", "error 1", "error 2"]
+        await webhook_service_minimal.close()
+
+    @pytest.mark.asyncio
+    async def test_batch_size_caps_events_per_request(self, webhook_service_minimal):
+        """Test that a batch never exceeds the configured size."""
+        webhook_service_minimal._batch_size = 2
+        webhook_service_minimal._rate_limiter = RateLimiter(max_requests=10, window=60)
+        webhook_service_minimal.client.post = AsyncMock(return_value=Mock(status_code=200))
+
+        for i in range(3):
+            await webhook_service_minimal.send_error_notification(f"error {i}")
+        await webhook_service_minimal.flush()
+
+        bodies = [orjson.loads(call.kwargs["content"]) for call in webhook_service_minimal.client.post.call_args_list]
+        assert len(bodies[0]["events"]) == 2
+        assert bodies[1]["message"] == "error 2"
+        await webhook_service_minimal.close()
+
+    @pytest.mark.asyncio
+    async def test_payload_serialized_with_non_string_context_keys(self, webhook_service_minimal):
+        """Test that context with non-string keys serializes like the stdlib encoder."""
+        webhook_service_minimal.client.post = AsyncMock(return_value=Mock(status_code=200))
+
+        await webhook_service_minimal.send_error_notification(
+            "Test error", context={404: "not found", "nested": {"count": 2}}
+        )
+        await webhook_service_minimal.flush()
+
+        payload = orjson.loads(webhook_service_minimal.client.post.call_args.kwargs["content"])
+        assert payload["context"] == {"404": "not found", "nested": {"count": 2}}
+        await webhook_service_minimal.close()
+
+    def test_will_notify(self, webhook_service_minimal):
+        """Test the cheap pre-check callers use before formatting tracebacks."""
+        enabled_config = Mock(error_webhook_enabled=True, error_webhook_include_traceback=False)
+        with patch('src.scanner.services.webhook_service.config', enabled_config):
+            assert webhook_service_minimal.will_notify("CRITICAL") is True
+            assert webhook_service_minimal.will_notify("INFO") is False
+            # Tracebacks are excluded from payloads, so there's no need to format one
+            assert webhook_service_minimal.will_notify("CRITICAL", with_traceback=True) is False
+
+            webhook_service_minimal._url_valid = False
+            assert webhook_service_minimal.will_notify("CRITICAL") is False
+
+        disabled_config = Mock(error_webhook_enabled=False)
+        with patch('src.scanner.services.webhook_service.config', disabled_config):
+            webhook_service_minimal._url_valid = True
+            assert webhook_service_minimal.will_notify("CRITICAL") is False
+
+    def test_is_valid_url(self, webhook_service_minimal):
+        """Test webhook URL validation."""
+        assert webhook_service_minimal._is_valid_url("https://hooks.slack.com/services/X")
+        assert webhook_service_minimal._is_valid_url("http://localhost:8080/hook")
+
+        assert not webhook_service_minimal._is_valid_url("")
+        assert not webhook_service_minimal._is_valid_url(None)
+        assert not webhook_service_minimal._is_valid_url("https://")
+        assert not webhook_service_minimal._is_valid_url("https:///path")
+        assert not webhook_service_minimal._is_valid_url("ftp://example.com")
+        assert not webhook_service_minimal._is_valid_url("example.com/hook")
+        assert not webhook_service_minimal._is_valid_url("http://[::1")
+
+    @pytest.mark.asyncio
+    async def test_invalid_url_is_rejected_without_sending(self, webhook_service_minimal):
+        """Test that an invalid URL cached at init short-circuits sending."""
+        webhook_service_minimal._url_valid = False
+        webhook_service_minimal.client.post = AsyncMock()
+
+        result = await webhook_service_minimal.send_error_notification("Test error")
+
+        assert result is False
+        webhook_service_minimal.client.post.assert_not_called()
+
     def test_should_notify_case_sensitive(self, webhook_service_minimal):
         """Test _should_notify with different case levels."""
         result1 = webhook_service_minimal._should_notify("error")
@@ -480,6 +650,15 @@ class TestSendErrorNotification:
         assert result2 is True  
         assert result3 is False
 
+    def test_should_notify_uses_min_level_from_init(self, webhook_service_minimal):
+        """Test that levels are compared against the threshold captured at init."""
+        webhook_service_minimal._min_level_value = 30  # WARNING
+
+        assert webhook_service_minimal._should_notify("WARNING") is True
+        assert webhook_service_minimal._should_notify("CRITICAL") is True
+        assert webhook_service_minimal._should_notify("INFO") is False
+        assert webhook_service_minimal._should_notify("UNKNOWN") is False
+
 
 class TestWebhookServiceOptionalMethods:
     """Test optional methods that may exist in WebhookService."""
@@ -16,7 +16,7 @@ class TestCostTrackerInitialization:
 
     def test_initialization_basic(self, cost_tracker):
         """Test basic initialization."""
-        assert cost_tracker.session_costs == []
+        assert list(cost_tracker.session_costs) == []
         assert isinstance(cost_tracker.session_start, datetime)
         
         # Check that pricing constants exist
@@ -27,7 +27,7 @@ class TestCostTrackerInitialization:
         """Test that initialization creates empty session."""
         tracker = CostTracker()
         
-        assert tracker.session_costs == []
+        assert list(tracker.session_costs) == []
         assert isinstance(tracker.session_start, datetime)
 
     def test_initialization_sets_current_time(self):
@@ -51,6 +51,12 @@ class TestCostTrackerInitialization:
         assert tracker.GEMINI_COSTS["output_tokens_per_1k"] > 0
         assert tracker.GEMINI_COSTS["image_processing"] > 0
 
+    def test_per_token_costs_match_gemini_costs(self):
+        """Test that the derived per-token prices agree with GEMINI_COSTS."""
+        assert CostTracker._INPUT_COST_PER_TOKEN * 1000 == pytest.approx(CostTracker.GEMINI_COSTS["input_tokens_per_1k"])
+        assert CostTracker._OUTPUT_COST_PER_TOKEN * 1000 == pytest.approx(CostTracker.GEMINI_COSTS["output_tokens_per_1k"])
+        assert CostTracker._IMAGE_COST == CostTracker.GEMINI_COSTS["image_processing"]
+
     def test_tcg_costs_constants(self):
         """Test that TCG cost constants are properly defined."""
         tracker = CostTracker()
@@ -240,7 +246,7 @@ class TestTrackGeminiUsage:
         assert "cost_usd" in record
         
         # Check field types
-        assert isinstance(record["timestamp"], str)
+        assert isinstance(record["timestamp"], float)
         assert record["service"] == "gemini"
         assert record["operation"] == "test_op"
         assert isinstance(record["prompt_tokens"], int)
@@ -249,14 +255,15 @@ class TestTrackGeminiUsage:
         assert isinstance(record["cost_usd"], (int, float))
 
     def test_track_gemini_usage_timestamp_format(self, tracker):
-        """Test that timestamp is in ISO format."""
+        """Test that timestamp is an epoch float convertible to a datetime."""
+        before = datetime.now()
         tracker.track_gemini_usage(100, 50)
         
         timestamp = tracker.session_costs[0]["timestamp"]
         
-        # Should be able to parse as ISO format
-        parsed_time = datetime.fromisoformat(timestamp)
-        assert isinstance(parsed_time, datetime)
+        # Should convert back to the wall-clock time the record was made
+        parsed_time = datetime.fromtimestamp(timestamp)
+        assert before - timedelta(seconds=1) <= parsed_time <= datetime.now() + timedelta(seconds=1)
 
     def test_large_token_usage(self, cost_tracker):
         """Test handling of large token counts."""
@@ -281,6 +288,17 @@ class TestTrackGeminiUsage:
         assert cost == 0.0
         assert len(tracker.session_costs) == 1
 
+    def test_session_history_is_bounded(self, tracker):
+        """Test that only the most recent records are kept while totals cover all of them."""
+        with patch.object(CostTracker, 'HISTORY_SIZE', 3):
+            tracker = CostTracker()
+        
+        for i in range(5):
+            tracker.track_gemini_usage(100, 50, operation=f"op{i}")
+        
+        assert [r["operation"] for r in tracker.session_costs] == ["op2", "op3", "op4"]
+        assert tracker.get_session_summary()["total_requests"] == 5
+
     def test_track_gemini_usage_very_large_tokens(self, tracker):
         """Test handling of very large token counts."""
         cost = tracker.track_gemini_usage(
@@ -353,7 +371,7 @@ class TestTrackTcgUsage:
         assert "cost_usd" in record
         
         # Check field types
-        assert isinstance(record["timestamp"], str)
+        assert isinstance(record["timestamp"], float)
         assert record["service"] == "tcg_api"
         assert record["operation"] == "custom_op"
         assert record["cost_usd"] == 0.0
@@ -485,6 +503,14 @@ class TestSessionSummary:
         assert summary["session_duration_minutes"] > 0
         assert summary["session_duration_minutes"] <= 1  # Should be very small for new tracker
 
+    def test_get_session_summary_duration_uses_monotonic_clock(self, tracker):
+        """Test that duration comes from the monotonic clock, not wall time."""
+        start = tracker._session_start_monotonic
+        with patch('src.scanner.utils.cost_tracker.time.monotonic', return_value=start + 120):
+            summary = tracker.get_session_summary()
+        
+        assert summary["session_duration_minutes"] == pytest.approx(2.0)
+
     def test_get_session_summary_estimated_monthly_cost(self, tracker):
         """Test estimated monthly cost calculation."""
         tracker.track_gemini_usage(1000, 500, True)
@@ -580,6 +606,18 @@ class TestResetSession:
         
         assert tracker.session_start > original_start
 
+    def test_reset_session_clears_running_totals(self, tracker):
+        """Test that the summary starts from zero after a reset."""
+        tracker.track_gemini_usage(1000, 500, True)
+        tracker.reset_session()
+        
+        cost = tracker.track_gemini_usage(100, 50, operation="analyze_card")
+        summary = tracker.get_session_summary()
+        
+        assert summary["total_requests"] == 1
+        assert summary["total_cost_usd"] == round(cost, 6)
+        assert summary["services"]["gemini"]["operations"] == {"analyze_card": 1}
+
     def test_reset_session_with_empty_session(self, tracker):
         """Test reset with already empty session."""
         assert len(tracker.session_costs) == 0
@@ -706,4 +744,12 @@ class TestEstimateScanCost:
         
         # With image should cost more due to image processing
         assert with_image["total_cost"] > without_image["total_cost"]
-        assert with_image["image_cost"] > without_image["image_cost"]
\ No newline at end of file
+        assert with_image["image_cost"] > without_image["image_cost"]
+
+    def test_estimate_scan_cost_returns_independent_copies(self, tracker):
+        """Test that mutating a returned estimate doesn't affect later calls."""
+        estimate = tracker.estimate_scan_cost(use_image=True)
+        estimate["total_cost"] = -1
+        
+        assert tracker.estimate_scan_cost(use_image=True)["total_cost"] > 0
+        assert CostTracker().estimate_scan_cost(use_image=True)["total_cost"] > 0